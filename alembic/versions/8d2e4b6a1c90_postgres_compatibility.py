@@ -0,0 +1,35 @@
+"""postgres compatibility
+
+Revision ID: 8d2e4b6a1c90
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b6a1c90'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # в SQLite INTEGER и так 64-битный, id из Telegram не помещаются в INTEGER только в PostgreSQL
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.alter_column('users', 'id', type_=sa.BigInteger(), existing_type=sa.Integer(), existing_nullable=False)
+    op.alter_column('orders', 'user_id', type_=sa.BigInteger(), existing_type=sa.Integer(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.alter_column('orders', 'user_id', type_=sa.Integer(), existing_type=sa.BigInteger(), existing_nullable=False)
+    op.alter_column('users', 'id', type_=sa.Integer(), existing_type=sa.BigInteger(), existing_nullable=False)
@@ -0,0 +1,71 @@
+"""sales aggregates
+
+Revision ID: c47a9e5d3f12
+Revises: 8d2e4b6a1c90
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47a9e5d3f12'
+down_revision: Union[str, Sequence[str], None] = '8d2e4b6a1c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_sales',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('orders_count', sa.Integer(), nullable=False),
+    sa.Column('cancelled_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table('product_sales',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_index(op.f('ix_product_sales_revenue'), 'product_sales', ['revenue'], unique=False)
+
+    # заполняем агрегаты по уже существующим заказам, дальше их ведёт приложение
+    if op.get_bind().dialect.name == 'postgresql':
+        local_day = "CAST(created_at + INTERVAL '3 hours' AS DATE)"
+    else:
+        local_day = "date(created_at, '+3 hours')"
+    op.execute(f"""
+        INSERT INTO daily_sales (day, orders_count, cancelled_count, revenue)
+        SELECT {local_day},
+               SUM(CASE WHEN status = 'done' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'cancelled' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'done' THEN amount ELSE 0 END)
+        FROM orders
+        WHERE status IN ('done', 'cancelled')
+        GROUP BY {local_day}
+    """)
+    op.execute("""
+        INSERT INTO product_sales (product_id, quantity, revenue)
+        SELECT order_items.product_id,
+               SUM(order_items.quantity),
+               SUM(order_items.price * order_items.quantity)
+        FROM order_items
+        JOIN orders ON orders.id = order_items.order_id
+        JOIN products ON products.id = order_items.product_id
+        WHERE orders.status = 'done'
+        GROUP BY order_items.product_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_product_sales_revenue'), table_name='product_sales')
+    op.drop_table('product_sales')
+    op.drop_table('daily_sales')
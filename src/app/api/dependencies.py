@@ -0,0 +1,16 @@
+from fastapi import Header, HTTPException, Request, status
+
+from src.app.config.settings import settings
+from src.app.database.sqlite_db import AsyncSQLiteDatabase
+
+
+def get_db(request: Request) -> AsyncSQLiteDatabase:
+    return request.app.state.db
+
+
+def require_export_token(x_api_key: str | None = Header(default=None)) -> None:
+    # выгрузки содержат телефоны и адреса клиентов - без токена они выключены
+    if not settings.EXPORT_API_TOKEN:
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "export is disabled")
+    if x_api_key != settings.EXPORT_API_TOKEN:
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "wrong api key")
@@ -1,32 +1,68 @@
-from fastapi import FastAPI, HTTPException, status
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
 from fastapi.templating import Jinja2Templates
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel
 
+from src.app.api.dependencies import get_db
+from src.app.api.metrics import HTTP_REQUEST_SECONDS
 from src.app.api.routers.auth import auth_router
+from src.app.api.routers.export import export_router
 from src.app.api.routers.users import user_router
 from src.app.api.services import user_service as us
 from src.app.database.sqlite_db import AsyncSQLiteDatabase
 
-app = FastAPI(title="Админпанель пиццерии")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # одно подключение к БД (пул соединений) на весь процесс API
+    app.state.db = AsyncSQLiteDatabase()
+    yield
+    await app.state.db.close()
+
+
+app = FastAPI(title="Админпанель пиццерии", lifespan=lifespan)
 app.include_router(user_router)
 app.include_router(auth_router)
+app.include_router(export_router)
 templates = Jinja2Templates(directory="src/app/api/templates")
 
 
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # шаблон пути (/user/{user_id}), а не сам путь - иначе по метке на каждый id
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.labels(
+        method=request.method,
+        route=route.path if route else "unmatched",
+        status=response.status_code,
+    ).observe(time.perf_counter() - started)
+    return response
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 class UserResponse(BaseModel):
     id: int
     name: str
 
 
 @app.get("/user", response_model=list[UserResponse])
-async def api_get_users():
-    users = await us.get_users(AsyncSQLiteDatabase)
+async def api_get_users(db: AsyncSQLiteDatabase = Depends(get_db)):
+    users = await us.get_users(db)
     return users
 
 
 @app.get("/user/{user_id}", response_model=UserResponse)
-async def api_get_user_by_id(user_id: int):
-    user = await us.get_user_by_id(AsyncSQLiteDatabase, user_id)
+async def api_get_user_by_id(user_id: int, db: AsyncSQLiteDatabase = Depends(get_db)):
+    user = await us.get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,8 @@
+from prometheus_client import Histogram
+
+# метрики процесса API, метрики бота - в bot/metrics.py
+HTTP_REQUEST_SECONDS = Histogram(
+    "api_request_seconds",
+    "Время обработки HTTP-запроса",
+    ["method", "route", "status"],
+)
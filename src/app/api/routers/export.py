@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import Depends, Query
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRouter
+
+from src.app.api.dependencies import get_db, require_export_token
+from src.app.api.services import export_service as es
+from src.app.database.sqlite_db import AsyncSQLiteDatabase
+
+export_router = APIRouter(
+    prefix="/export", tags=["Export"], dependencies=[Depends(require_export_token)]
+)
+
+ExportFormat = Literal["csv", "ndjson"]
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def streaming_export(content, name: str, fmt: ExportFormat) -> StreamingResponse:
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@export_router.get("/orders")
+async def export_orders(
+    fmt: ExportFormat = Query("csv", alias="format"),
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    db: AsyncSQLiteDatabase = Depends(get_db),
+):
+    if fmt == "csv":
+        content = es.orders_csv(db, date_from, date_to)
+    else:
+        content = es.orders_ndjson(db, date_from, date_to)
+    return streaming_export(content, "orders", fmt)
+
+
+@export_router.get("/users")
+async def export_users(
+    fmt: ExportFormat = Query("csv", alias="format"),
+    db: AsyncSQLiteDatabase = Depends(get_db),
+):
+    content = es.users_csv(db) if fmt == "csv" else es.users_ndjson(db)
+    return streaming_export(content, "users", fmt)
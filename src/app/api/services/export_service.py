@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from src.app.database.sqlite_db import AsyncSQLiteDatabase
+
+USER_FIELDS = ["id", "username", "first_name", "last_name", "created_at", "is_admin"]
+ORDER_FIELDS = [
+    "id",
+    "created_at",
+    "user_id",
+    "client_name",
+    "phone",
+    "address",
+    "additional_info",
+    "amount",
+    "status",
+]
+ORDER_ITEM_FIELDS = ["product_id", "product_name", "size", "quantity", "price"]
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def users_csv(db: AsyncSQLiteDatabase) -> AsyncIterator[str]:
+    # каждая пачка из БД сразу уходит клиентом одним куском
+    yield _csv_chunk([USER_FIELDS])
+    async for users in db.stream_users():
+        yield _csv_chunk(
+            [getattr(user, field) for field in USER_FIELDS] for user in users
+        )
+
+
+async def users_ndjson(db: AsyncSQLiteDatabase) -> AsyncIterator[str]:
+    async for users in db.stream_users():
+        yield "".join(
+            json.dumps(
+                {field: _json_value(getattr(user, field)) for field in USER_FIELDS},
+                ensure_ascii=False,
+            )
+            + "\n"
+            for user in users
+        )
+
+
+async def orders_csv(
+    db: AsyncSQLiteDatabase, date_from=None, date_to=None
+) -> AsyncIterator[str]:
+    """Одна строка на позицию заказа, поля заказа повторяются."""
+    yield _csv_chunk([ORDER_FIELDS + ORDER_ITEM_FIELDS])
+    async for rows in db.stream_order_rows(date_from, date_to):
+        yield _csv_chunk(rows)
+
+
+async def orders_ndjson(
+    db: AsyncSQLiteDatabase, date_from=None, date_to=None
+) -> AsyncIterator[str]:
+    """Один JSON-объект на заказ с вложенным списком items."""
+    order = None
+    async for rows in db.stream_order_rows(date_from, date_to):
+        lines = []
+        for row in rows:
+            if order is None or order["id"] != row.id:
+                # строки заказа идут подряд, в памяти держим только текущий заказ
+                if order is not None:
+                    lines.append(json.dumps(order, ensure_ascii=False) + "\n")
+                order = {
+                    field: _json_value(getattr(row, field)) for field in ORDER_FIELDS
+                }
+                order["items"] = []
+            order["items"].append(
+                {field: getattr(row, field) for field in ORDER_ITEM_FIELDS}
+            )
+        if lines:
+            yield "".join(lines)
+    if order is not None:
+        yield json.dumps(order, ensure_ascii=False) + "\n"
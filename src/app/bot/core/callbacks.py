@@ -18,48 +18,60 @@ class MenuNavigationCallback(CallbackData, prefix="menu"):
 
     @classmethod
     def CART(cls):
-        return cls(action=CartCommands.CART)
+        return cls(action=CartCommands.CART).pack()
 
     @classmethod
     def MAIN_MENU(cls):
-        return cls(action=MenuCommands.MAIN_MENU)
+        return cls(action=MenuCommands.MAIN_MENU).pack()
 
     @classmethod
     def CATALOG(cls):
-        return cls(action=MenuCommands.CATALOG)
+        return cls(action=MenuCommands.CATALOG).pack()
 
     @classmethod
     def CONTACTS(cls):
-        return cls(action=MenuCommands.CONTACTS)
+        return cls(action=MenuCommands.CONTACTS).pack()
 
     @classmethod
     def ORDERS(cls):
-        return cls(action=OrderCommands.ORDERS)
+        return cls(action=OrderCommands.ORDERS).pack()
 
     @classmethod
     def ADMIN(cls):
-        return cls(action=AdminCommands.ADMIN)
+        return cls(action=AdminCommands.ADMIN).pack()
 
 
 class OrderCallback(CallbackData, prefix="order"):
     action: OrderCommands
-    order_id: int
+    order_id: int | None = None
+    cursor: int | None = None
+    backward: bool = False
+
+    @classmethod
+    def orders_next(cls, cursor: int):
+        return cls(action=OrderCommands.ORDERS_PAGE, cursor=cursor).pack()
+
+    @classmethod
+    def orders_prev(cls, cursor: int):
+        return cls(
+            action=OrderCommands.ORDERS_PAGE, cursor=cursor, backward=True
+        ).pack()
 
     @classmethod
     def get_order_details(cls, order_id):
-        return cls(action=OrderCommands.ORDER_DETAILS, order_id=order_id)
+        return cls(action=OrderCommands.ORDER_DETAILS, order_id=order_id).pack()
 
     @classmethod
     def cancel_order(cls, order_id):
-        return cls(action=OrderCommands.CANCEL, order_id=order_id)
+        return cls(action=OrderCommands.CANCEL, order_id=order_id).pack()
 
     @classmethod
     def confirm_order(cls, order_id):
-        return cls(action=OrderCommands.CONFIRM, order_id=order_id)
+        return cls(action=OrderCommands.CONFIRM, order_id=order_id).pack()
 
     @classmethod
     def edit_street(cls):
-        return cls(action=OrderCommands.EDIT_STREET)
+        return cls(action=OrderCommands.EDIT_STREET).pack()
 
 
 class CategoryNavigationCallback(CallbackData, prefix="category"):
@@ -67,15 +79,15 @@ class CategoryNavigationCallback(CallbackData, prefix="category"):
 
     @classmethod
     def PIZZAS(cls):
-        return cls(action=CategoryCommands.PIZZA)
+        return cls(action=CategoryCommands.PIZZA).pack()
 
     @classmethod
     def SNACKS(cls):
-        return cls(action=CategoryCommands.SNACK)
+        return cls(action=CategoryCommands.SNACK).pack()
 
     @classmethod
     def DRINKS(cls):
-        return cls(action=CategoryCommands.DRINK)
+        return cls(action=CategoryCommands.DRINK).pack()
 
 
 class CartCallback(CallbackData, prefix="cart"):
@@ -85,23 +97,27 @@ class CartCallback(CallbackData, prefix="cart"):
 
     @classmethod
     def increase(cls, product_id: int, size: SizesAvailable):
-        return cls(action=CartCommands.INCREASE, product_id=product_id, size=size)
+        return cls(
+            action=CartCommands.INCREASE, product_id=product_id, size=size
+        ).pack()
 
     @classmethod
     def decrease(cls, product_id: int, size: SizesAvailable):
-        return cls(action=CartCommands.DECREASE, product_id=product_id, size=size)
+        return cls(
+            action=CartCommands.DECREASE, product_id=product_id, size=size
+        ).pack()
 
     @classmethod
     def delete(cls, product_id: int, size: SizesAvailable):
-        return cls(action=CartCommands.DELETE, product_id=product_id, size=size)
+        return cls(action=CartCommands.DELETE, product_id=product_id, size=size).pack()
 
     @classmethod
     def ERASE_ALL(cls):
-        return cls(action=CartCommands.ERASE_ALL)
+        return cls(action=CartCommands.ERASE_ALL).pack()
 
     @classmethod
     def MAKE_ORDER(cls):
-        return cls(action=CartCommands.MAKE_ORDER)
+        return cls(action=CartCommands.MAKE_ORDER).pack()
 
 
 class ProductCallback(CallbackData, prefix="product"):
@@ -111,7 +127,9 @@ class ProductCallback(CallbackData, prefix="product"):
 
     @classmethod
     def view_product_details(cls, product_id: int):
-        return cls(action=ProductCommands.VIEW_PRODUCT_DETAILS, product_id=product_id)
+        return cls(
+            action=ProductCommands.VIEW_PRODUCT_DETAILS, product_id=product_id
+        ).pack()
 
     @classmethod
     def add_small_size(cls, product_id: int):
@@ -119,7 +137,7 @@ class ProductCallback(CallbackData, prefix="product"):
             action=CartCommands.ADD_TO_CART,
             product_id=product_id,
             size=SizesAvailable.SMALL,
-        )
+        ).pack()
 
     @classmethod
     def add_large_size(cls, product_id: int):
@@ -127,7 +145,7 @@ class ProductCallback(CallbackData, prefix="product"):
             action=CartCommands.ADD_TO_CART,
             product_id=product_id,
             size=SizesAvailable.LARGE,
-        )
+        ).pack()
 
 
 class AdminCallback(CallbackData, prefix="admin"):
@@ -139,66 +157,86 @@ class AdminCallback(CallbackData, prefix="admin"):
 
     @classmethod
     def ADD_PRODUCTS(cls):
-        return cls(action=AdminCommands.ADD_PRODUCT)
+        return cls(action=AdminCommands.ADD_PRODUCT).pack()
 
     @classmethod
     def add_product(cls, product_category: CategoriesAvailable):
-        return cls(action=AdminCommands.ADD_PRODUCT, product_category=product_category)
+        return cls(
+            action=AdminCommands.ADD_PRODUCT, product_category=product_category
+        ).pack()
 
     @classmethod
     def EDIT_PRODUCTS(cls):
-        return cls(action=AdminCommands.EDIT_PRODUCT, product_id=None)
+        return cls(action=AdminCommands.EDIT_PRODUCT, product_id=None).pack()
 
     @classmethod
     def edit_product(cls, product_id: int):
-        return cls(action=AdminCommands.EDIT_PRODUCT, product_id=product_id)
+        return cls(action=AdminCommands.EDIT_PRODUCT, product_id=product_id).pack()
 
     @classmethod
     def edit_field(cls, product_id: int, field: EditingField):
         return cls(
             action=AdminCommands.EDIT_FIELD, product_id=product_id, editing_field=field
-        )
+        ).pack()
 
     @classmethod
     def DELETE_PRODUCTS(cls):
-        return cls(action=AdminCommands.DELETE_PRODUCT, product_id=None)
+        return cls(action=AdminCommands.DELETE_PRODUCT, product_id=None).pack()
 
     @classmethod
     def delete_product(cls, product_id: int):
-        return cls(action=AdminCommands.DELETE_PRODUCT, product_id=product_id)
+        return cls(action=AdminCommands.DELETE_PRODUCT, product_id=product_id).pack()
 
     @classmethod
     def confirm_deleting_product(cls, product_id: int):
-        return cls(action=AdminCommands.CONFIRM_DELETING_PRODUCT, product_id=product_id)
+        return cls(
+            action=AdminCommands.CONFIRM_DELETING_PRODUCT, product_id=product_id
+        ).pack()
 
     @classmethod
     def ADMIN_LIST(cls):
-        return cls(action=AdminCommands.ADMIN_LIST)
+        return cls(action=AdminCommands.ADMIN_LIST).pack()
+
+    @classmethod
+    def SALES_REPORT(cls):
+        return cls(action=AdminCommands.SALES_REPORT).pack()
+
+    @classmethod
+    def BROADCAST(cls):
+        return cls(action=AdminCommands.BROADCAST).pack()
+
+    @classmethod
+    def BROADCAST_CONFIRM(cls):
+        return cls(action=AdminCommands.BROADCAST_CONFIRM).pack()
+
+    @classmethod
+    def BROADCAST_CANCEL(cls):
+        return cls(action=AdminCommands.BROADCAST_CANCEL).pack()
 
     @classmethod
     def get_admin_info(cls, user_id: int):
-        return cls(action=AdminCommands.GET_ADMIN_INFO, user_id=user_id)
+        return cls(action=AdminCommands.GET_ADMIN_INFO, user_id=user_id).pack()
 
     @classmethod
     def CREATE_ADMIN(cls):
-        return cls(action=AdminCommands.CREATE_ADMIN)
+        return cls(action=AdminCommands.CREATE_ADMIN).pack()
 
     @classmethod
     def create_admin(cls, user_id: int):
-        return cls(action=AdminCommands.CREATE_ADMIN, user_id=user_id)
+        return cls(action=AdminCommands.CREATE_ADMIN, user_id=user_id).pack()
 
     @classmethod
     def dismiss_admin(cls, user_id: int):
-        return cls(action=AdminCommands.DISMISS_ADMIN, user_id=user_id)
+        return cls(action=AdminCommands.DISMISS_ADMIN, user_id=user_id).pack()
 
     @classmethod
     def TEST_FUNCTIONS(cls):
-        return cls(action=AdminCommands.TEST_FUNCTIONS)
+        return cls(action=AdminCommands.TEST_FUNCTIONS).pack()
 
     @classmethod
     def TEST_PAYMENT(cls):
-        return cls(action=AdminCommands.TEST_PAYMENT)
+        return cls(action=AdminCommands.TEST_PAYMENT).pack()
 
     @classmethod
     def CHECK_DB(cls):
-        return cls(action=AdminCommands.CHECK_DB)
+        return cls(action=AdminCommands.CHECK_DB).pack()
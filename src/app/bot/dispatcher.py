@@ -0,0 +1,95 @@
+from aiogram import Bot, Dispatcher
+from redis.asyncio import Redis
+
+from src.app.bot.handlers.handlers_routers import routers
+from src.app.bot.metrics import RATE_LIMIT_QUEUE
+from src.app.bot.middlewares import (
+    CallbackAnswerMiddleware,
+    CancelDebouncedMiddleware,
+    HandlerLabelMiddleware,
+    RateLimitMiddleware,
+    SkipUnchangedEditMiddleware,
+    UpdateMetricsMiddleware,
+)
+from src.app.bot.services.broadcast_service import BroadcastService
+from src.app.bot.services.cart_store import init_cart_store
+from src.app.bot.services.debounce import Debouncer
+from src.app.config.logger import logger
+from src.app.config.settings import settings
+from src.app.database.redis_db import init_fsm_storage, init_redis
+from src.app.database.sqlite_db import AsyncSQLiteDatabase, init_async_sqlite
+
+
+def create_bot(redis: Redis) -> Bot:
+    bot = Bot(settings.BOT_TOKEN)
+    # первая зарегистрированная middleware - внешняя: пропущенная правка не ждёт лимита
+    bot.session.middleware(
+        SkipUnchangedEditMiddleware(redis, ttl=settings.EDIT_FINGERPRINT_TTL)
+    )
+    # bucket у каждого процесса свой: общий лимит бота делится между воркерами,
+    # чтобы вместе они не превышали лимит Telegram
+    rate_limit = RateLimitMiddleware(
+        global_rate=settings.RATE_LIMIT_GLOBAL / settings.BOT_WORKERS,
+        global_burst=max(1, settings.RATE_LIMIT_GLOBAL_BURST // settings.BOT_WORKERS),
+        chat_rate=settings.RATE_LIMIT_CHAT,
+        chat_burst=settings.RATE_LIMIT_CHAT_BURST,
+        max_retries=settings.RATE_LIMIT_MAX_RETRIES,
+        retry_jitter=settings.RATE_LIMIT_RETRY_JITTER,
+    )
+    bot.session.middleware(rate_limit)
+    RATE_LIMIT_QUEUE.set_function(lambda: rate_limit.queue_depth)
+    return bot
+
+
+async def create_dispatcher() -> Dispatcher:
+    """Dispatcher со всеми роутерами и ресурсами - один на процесс бота."""
+    redis = await init_redis()
+    dp = Dispatcher(storage=init_fsm_storage(redis))
+    sqlite_db = await init_async_sqlite()
+    dp["redis"] = redis
+    dp["cart_store"] = init_cart_store(redis)
+    cart_renders = Debouncer(settings.CART_RENDER_DELAY_MS / 1000)
+    dp["cart_renders"] = cart_renders
+    dp["db"] = sqlite_db
+    dp["broadcasts"] = BroadcastService(
+        redis,
+        sqlite_db,
+        chunk_size=settings.BROADCAST_CHUNK_SIZE,
+        # рассылку ведёт один воркер, но идёт она через его долю общего лимита
+        rate=settings.BROADCAST_RATE / settings.BOT_WORKERS,
+    )
+    dp.include_routers(*routers)
+    setup_metrics(dp)
+    # inner middleware: флаги обработчика (отказ от автоответа) известны только здесь
+    dp.callback_query.middleware(CallbackAnswerMiddleware())
+    dp.callback_query.middleware(CancelDebouncedMiddleware(cart_renders))
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+    logger.info("Все сервисы запущены")
+    return dp
+
+
+def setup_metrics(dp: Dispatcher) -> None:
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    # inner middleware диспетчера действуют и во вложенных роутерах
+    for name, observer in dp.observers.items():
+        if name not in ("update", "error"):
+            observer.middleware(HandlerLabelMiddleware())
+
+
+async def on_startup(bot: Bot, broadcasts: BroadcastService):
+    await broadcasts.resume(bot)
+
+
+async def on_shutdown(
+    dispatcher: Dispatcher,
+    db: AsyncSQLiteDatabase,
+    broadcasts: BroadcastService,
+    cart_renders: Debouncer,
+):
+    await broadcasts.stop()
+    # отложенные перерисовки корзин читают Redis - до закрытия соединения
+    await cart_renders.close()
+    await db.close()
+    # закрывает и общее соединение Redis
+    await dispatcher.storage.close()
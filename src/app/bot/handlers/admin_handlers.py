@@ -5,32 +5,27 @@ from aiogram.types import CallbackQuery, Message
 from redis.asyncio import Redis
 
 from src.app.bot.core.callbacks import AdminCallback, MenuNavigationCallback
-from src.app.bot.keyboards import adm_kb, nav_kb, tst_kb
+from src.app.bot.keyboards import adm_kb, tst_kb
+from src.app.bot.middlewares import AdminOnlyMiddleware
+from src.app.bot.services.broadcast_service import BroadcastService
+from src.app.bot.services.user_service import forget_user
 from src.app.config.logger import logger
 from src.app.config.settings import settings
 from src.app.database.sqlite_db import AsyncSQLiteDatabase
 
-admin_router = Router()
+admin_router = Router(name="admin")
+admin_router.callback_query.middleware(AdminOnlyMiddleware())
+admin_router.message.middleware(AdminOnlyMiddleware())
 
 
 @admin_router.callback_query(MenuNavigationCallback.filter(F.action == "admin"))
-async def cmd_handle_admin(
-    callback: CallbackQuery, state: FSMContext, db: AsyncSQLiteDatabase
-):
-    user_id = callback.from_user.id
-    user = await db.get_user_by_id(user_id)
-    if user.is_admin:
-        await state.clear()
-        await callback.message.edit_text(
-            "АДМИНПАНЕЛЬ:\n",
-            reply_markup=await adm_kb.admin(),
-        )
-
-    else:
-        await callback.message.edit_text(
-            "Я умею отвечать только на меню. Выбери пункт ниже:",
-            reply_markup=await nav_kb.main_menu(user),
-        )
+async def cmd_handle_admin(callback: CallbackQuery, state: FSMContext):
+    # права проверяет AdminOnlyMiddleware
+    await state.clear()
+    await callback.message.edit_text(
+        "АДМИНПАНЕЛЬ:\n",
+        reply_markup=adm_kb.admin(),
+    )
 
 
 @admin_router.callback_query(AdminCallback.filter(F.action == "check_db"))
@@ -43,11 +38,115 @@ async def cmd_handle_redis(
     sqlite_result = await db.check_connection()
     await callback.message.edit_text(
         f"REDIS_STATUS: {'OK' if redis_result else 'FAIL'}\nSQLITE_STATUS: {'OK' if sqlite_result else 'FAIL'}",
-        reply_markup=await adm_kb.admin(),
+        reply_markup=adm_kb.admin(),
     )
     await redis.delete("REDIS_STATUS")
 
 
+@admin_router.callback_query(AdminCallback.filter(F.action == "sales_report"))
+async def sales_report(callback: CallbackQuery, db: AsyncSQLiteDatabase):
+    # читаем только готовые агрегаты: время не зависит от объёма истории заказов
+    days = await db.get_daily_sales(days=7)
+    top_products = await db.get_top_products(limit=5)
+
+    orders_count = sum(day.orders_count for day in days)
+    revenue = sum(day.revenue for day in days)
+    average_check = revenue / orders_count if orders_count else 0
+    days_text = "\n".join(
+        f"{day.day:%d.%m}: {day.revenue:.2f} BYN ({day.orders_count} зак., отмен: {day.cancelled_count})"
+        for day in days
+    )
+    products_text = "\n".join(
+        f"{i}. {item.product.emoji} {item.product.name} - {item.quantity} шт. -- {item.revenue:.2f} BYN"
+        for i, item in enumerate(
+            (item for item in top_products if item.product), start=1
+        )
+    )
+    await callback.message.edit_text(
+        f"ОТЧЁТ ПО ПРОДАЖАМ\n\n"
+        f"Выручка по дням:\n{days_text or 'нет оплаченных заказов'}\n\n"
+        f"Итого за период: {revenue:.2f} BYN, заказов: {orders_count}\n"
+        f"Средний чек: {average_check:.2f} BYN\n\n"
+        f"Топ продуктов:\n{products_text or 'нет продаж'}",
+        reply_markup=await adm_kb.sales_report(),
+    )
+
+
+class Broadcast(StatesGroup):
+    compose = State()
+    confirm = State()
+
+
+def broadcast_progress_text(progress: dict[str, str]) -> str:
+    done = int(progress["sent"]) + int(progress["blocked"]) + int(progress["failed"])
+    return (
+        f"РАССЫЛКА ИДЁТ\n\nОбработано: {done} из {progress['total']}\n"
+        f"Доставлено: {progress['sent']}\nЗаблокировали бота: {progress['blocked']}\n"
+        f"Ошибок: {progress['failed']}"
+    )
+
+
+@admin_router.callback_query(AdminCallback.filter(F.action == "broadcast"))
+async def broadcast_menu(
+    callback: CallbackQuery, state: FSMContext, broadcasts: BroadcastService
+):
+    progress = await broadcasts.progress()
+    if progress is not None:
+        await callback.message.edit_text(
+            broadcast_progress_text(progress),
+            reply_markup=await adm_kb.broadcast_progress(),
+        )
+        return
+    await state.set_state(Broadcast.compose)
+    await callback.message.edit_text(
+        "РАССЫЛКА\n\nОтправьте сообщение, которое получат все пользователи "
+        "(текст, фото, видео...):",
+        reply_markup=await adm_kb.cancel_admin_action(),
+    )
+
+
+@admin_router.message(Broadcast.compose)
+async def broadcast_compose(
+    message: Message, state: FSMContext, db: AsyncSQLiteDatabase
+):
+    await state.update_data(broadcast_message_id=message.message_id)
+    await state.set_state(Broadcast.confirm)
+    users_count = await db.count_active_users()
+    await message.answer(
+        f"РАССЫЛКА\n\nСообщение выше получат {users_count} польз. Отправить?",
+        reply_markup=await adm_kb.broadcast_confirm(),
+    )
+
+
+@admin_router.callback_query(
+    Broadcast.confirm, AdminCallback.filter(F.action == "broadcast_confirm")
+)
+async def broadcast_confirm(
+    callback: CallbackQuery, state: FSMContext, broadcasts: BroadcastService
+):
+    message_id = await state.get_value("broadcast_message_id")
+    await state.clear()
+    # отправка идёт в фоне, обработчик сразу отвечает администратору
+    broadcast_id = await broadcasts.start(
+        callback.bot, callback.message.chat.id, message_id
+    )
+    await callback.message.edit_text(
+        "РАССЫЛКА\n\n✅ Рассылка запущена, по окончании придёт отчёт."
+        if broadcast_id
+        else "РАССЫЛКА\n\n❌ ОШИБКА! Предыдущая рассылка ещё не закончилась.",
+        reply_markup=adm_kb.admin(),
+    )
+
+
+@admin_router.callback_query(AdminCallback.filter(F.action == "broadcast_cancel"))
+async def broadcast_cancel(callback: CallbackQuery, broadcasts: BroadcastService):
+    await broadcasts.cancel()
+    await callback.message.edit_text(
+        "РАССЫЛКА\n\nРассылка остановлена.",
+        reply_markup=adm_kb.admin(),
+    )
+
+
 class AddProduct(StatesGroup):
     choose_category = State()
     add_name = State()
@@ -204,7 +303,7 @@ async def state_product_create_add_nutrition(
         f"Описание: {f'\n{product.description}' if product.description else '---'}\n"
         f"Состав:{f'\n{product.ingredients}' if product.ingredients else '---'}\n"
         f"КБЖУ: {f'\n{product.nutrition}' if product.nutrition else '---'}",
-        reply_markup=await adm_kb.admin(),
+        reply_markup=adm_kb.admin(),
     )
 
 
@@ -212,10 +311,10 @@ async def state_product_create_add_nutrition(
     AdminCallback.filter((F.action == "delete_product") & (F.product_id.is_(None)))
 )
 async def cmd_product_delete(callback: CallbackQuery, db: AsyncSQLiteDatabase):
-    products = await db.get_products()
+    catalog = await db.get_catalog()
     await callback.message.edit_text(
         "УДАЛЕНИЕ ТОВАРА \nВыберите товар из списка для удаления:",
-        reply_markup=await adm_kb.product_delete(products),
+        reply_markup=adm_kb.product_delete(catalog.all(), catalog.version),
     )
 
 
@@ -244,7 +343,7 @@ async def cmd_product_confirmed_delete(
     await db.delete_product(product.id)
     await callback.message.edit_text(
         f"Товар {product.emoji} {product.name} успешно удалён\nАДМИНПАНЕЛЬ:",
-        reply_markup=await adm_kb.admin(),
+        reply_markup=adm_kb.admin(),
     )
 
 
@@ -256,10 +355,10 @@ class EditProduct(StatesGroup):
 async def cmd_product_edit_list(
     callback: CallbackQuery, callback_data: AdminCallback, db: AsyncSQLiteDatabase
 ):
-    products = await db.get_products()
+    catalog = await db.get_catalog()
     await callback.message.edit_text(
         "РЕДАКТИРОВАНИЕ ТОВАРА \nВыберите товар из списка для изменения:",
-        reply_markup=await adm_kb.product_edit(products),
+        reply_markup=adm_kb.product_edit(catalog.all(), catalog.version),
     )
 
 
@@ -361,9 +460,12 @@ async def input_admin_id(callback: CallbackQuery, state: FSMContext):
 
 
 @admin_router.message(AdminCreation.create)
-async def make_admin(message: Message, state: FSMContext, db: AsyncSQLiteDatabase):
+async def make_admin(
+    message: Message, state: FSMContext, db: AsyncSQLiteDatabase, redis: Redis
+):
     admin_id = message.text
-    admin = await db.get_user_by_id(admin_id)
+    # нечисловой ввод - сразу "не найден", без запроса с неверным типом id
+    admin = await db.get_user_by_id(int(admin_id)) if admin_id.isdigit() else None
     if not admin:
         await message.answer(
             f'ДОБАВЛЕНИЕ АДМИНИСТРАТОРА\n\n❌ ОШИБКА! Пользователь с ID "{admin_id}" не найден. Введите корректный ID:',
@@ -375,10 +477,11 @@ async def make_admin(message: Message, state: FSMContext, db: AsyncSQLiteDatabas
             reply_markup=await adm_kb.cancel_admin_action(),
         )
     else:
-        await db.make_admin(admin_id)
+        await db.make_admin(admin.id)
+        await forget_user(redis, admin.id)
         await message.answer(
             f"ДОБАВЛЕНИЕ АДМИНИСТРАТОРА\n\n✅ Новый администратор (ID {admin_id}, {admin.first_name}) успешно добавлен.",
-            reply_markup=await adm_kb.admin(),
+            reply_markup=adm_kb.admin(),
         )
         await state.clear()
 
@@ -391,20 +494,22 @@ async def dismiss_admin(
     callback_data: AdminCallback,
     state: FSMContext,
     db: AsyncSQLiteDatabase,
+    redis: Redis,
 ):
     admin_id = callback_data.user_id
     if int(admin_id) == settings.ADMIN_ID:
         await callback.message.edit_text(
             "УДАЛЕНИЕ АДМИНИСТРАТОРА\n\n❌ ОШИБКА! Суперадминистратор не может быть снят.",
-            reply_markup=await adm_kb.admin(),
+            reply_markup=adm_kb.admin(),
         )
         return
     else:
         admin = await db.get_user_by_id(admin_id)
         await db.dismiss_admin(admin.id)
+        await forget_user(redis, admin.id)
         await callback.message.edit_text(
             f"УДАЛЕНИЕ АДМИНИСТРАТОРА\n\n✅ Администратор (ID {admin.id}, {admin.first_name}) успешно снят.",
-            reply_markup=await adm_kb.admin(),
+            reply_markup=adm_kb.admin(),
         )
         await state.clear()
 
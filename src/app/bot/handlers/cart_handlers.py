@@ -1,7 +1,6 @@
-from aiogram import F, Router
+from aiogram import F, Router, flags
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery
-from redis.asyncio import Redis
+from aiogram.types import CallbackQuery, Message
 
 from src.app.bot.core.callbacks import (
     CartCallback,
@@ -9,133 +8,122 @@ from src.app.bot.core.callbacks import (
     ProductCallback,
 )
 from src.app.bot.keyboards import nav_kb
-from src.app.bot.services.cart_service import Cart, getall
+from src.app.bot.services.cart_service import (
+    Cart,
+    cart_total,
+    getall,
+)
+from src.app.bot.services.cart_store import CartStore
+from src.app.bot.services.debounce import Debouncer
 from src.app.database.sqlite_db import AsyncSQLiteDatabase
 
-cart_router = Router()
+cart_router = Router(name="cart")
+
+
+async def render_cart(message: Message, cart: Cart) -> None:
+    cart_items = await cart.get_cart_items()
+    cart_amount = cart_total(cart_items)
+    await message.edit_text(
+        ("КОРЗИНА:" if cart_items else "В корзине нет товаров."),
+        reply_markup=await nav_kb.init_cart(cart_items, cart_amount),
+    )
+
+
+def schedule_render(callback: CallbackQuery, cart: Cart, cart_renders: Debouncer):
+    # серия нажатий +/- перерисовывает корзину один раз, по итоговому состоянию
+    cart_renders.schedule(
+        callback.from_user.id, lambda: render_cart(callback.message, cart)
+    )
 
 
 @cart_router.callback_query(ProductCallback.filter(F.action == "add_to_cart"))
 async def cmd_add_to_cart(
     callback: CallbackQuery,
     callback_data: ProductCallback,
-    redis: Redis,
+    cart_store: CartStore,
     db: AsyncSQLiteDatabase,
 ):
-    (cart, product, size, products, product_key) = await getall(
-        callback, callback_data, redis, db
+    (cart, product, size, products, catalog_version) = await getall(
+        callback, callback_data, cart_store, db
     )
-    await cart.increase_prod_count(product.id, size)
-    await cart.add_price_amount(product.get_size_price(size))
-    quantity = await redis.hget(cart.cart_key, product_key)
-
-    cart_amount = await cart.get_current_price_amount()
+    quantity, items = await cart.increase(product, size)
+    cart_amount = cart_total(items)
 
     text = f"{product.category_rus.capitalize()} {product.name} {product.large_size_text if size == 'large' else product.small_size_text} ({quantity} шт) добавлен(а) в корзину"
     await callback.message.edit_text(
         f"{'Стандарт: ~ 650 грамм, 29 см\nБольшая: ~ 850 грамм, 36 см' if product.category == 'pizza' else ''}\n\n{text}\n\nОбщая стоимость корзины: {cart_amount:.2f} BYN\n\nДля продолжения заказа выбери пункт меню:",
-        reply_markup=await nav_kb.init_category_menu(products),
+        reply_markup=nav_kb.init_category_menu(products, catalog_version),
     )
 
 
 @cart_router.callback_query(MenuNavigationCallback.filter(F.action == "cart"))
 async def cmd_cart_menu(
-    callback: CallbackQuery, redis: Redis, db: AsyncSQLiteDatabase, state: FSMContext
+    callback: CallbackQuery,
+    cart_store: CartStore,
+    db: AsyncSQLiteDatabase,
+    state: FSMContext,
 ):
     await state.clear()
 
-    user_id = callback.from_user.id
-    cart = Cart(user_id, redis, db)
-
-    cart_items = await cart.get_cart_items()
-    cart_amount = await cart.get_current_price_amount()
-
-    await callback.message.edit_text(
-        ("КОРЗИНА:" if cart_items else "В корзине нет товаров."),
-        reply_markup=await nav_kb.init_cart(cart_items, cart_amount),
-    )
+    cart = Cart(callback.from_user.id, cart_store, db)
+    await render_cart(callback.message, cart)
 
 
 @cart_router.callback_query(CartCallback.filter(F.action == "increase"))
+@flags.debounced
 async def cmd_plus_quantity(
     callback: CallbackQuery,
     callback_data: ProductCallback,
-    redis: Redis,
+    cart_store: CartStore,
     db: AsyncSQLiteDatabase,
+    cart_renders: Debouncer,
 ):
-    (cart, product, size, _, _) = await getall(callback, callback_data, redis, db)
-    await cart.increase_prod_count(product.id, size)
-    await cart.add_price_amount(product.get_size_price(size))
-
-    cart_amount = await cart.get_current_price_amount()
-    cart_items = await cart.get_cart_items()
-
-    await callback.message.edit_text(
-        "КОРЗИНА:",
-        reply_markup=await nav_kb.init_cart(cart_items, cart_amount),
-    )
+    (cart, product, size, _, _) = await getall(callback, callback_data, cart_store, db)
+    await cart.increase(product, size)
+    schedule_render(callback, cart, cart_renders)
 
 
 @cart_router.callback_query(CartCallback.filter(F.action == "decrease"))
+@flags.debounced
 async def cmd_minus_quantity(
     callback: CallbackQuery,
     callback_data: ProductCallback,
-    redis: Redis,
+    cart_store: CartStore,
     db: AsyncSQLiteDatabase,
+    cart_renders: Debouncer,
 ):
-    (cart, product, size, _, product_key) = await getall(
-        callback, callback_data, redis, db
-    )
-    quantity = int(await redis.hget(cart.cart_key, product_key))
-    if quantity > 1:
-        await cart.decrease_prod_count(product.id, size)
-    else:
-        await cart.delete_product(product.id, size)
-    price = product.get_size_price(size)
-    await cart.sub_price_amount(price)
-    cart_amount = await cart.get_current_price_amount()
-    cart_items = await cart.get_cart_items()
-    await callback.message.edit_text(
-        "КОРЗИНА:",
-        reply_markup=await nav_kb.init_cart(cart_items, cart_amount),
-    )
+    (cart, product, size, _, _) = await getall(callback, callback_data, cart_store, db)
+    # при количестве 1 скрипт сам удаляет позицию
+    await cart.decrease(product, size)
+    schedule_render(callback, cart, cart_renders)
 
 
 @cart_router.callback_query(CartCallback.filter(F.action == "delete"))
+@flags.debounced
 async def cmd_delete_from_cart(
     callback: CallbackQuery,
     callback_data: ProductCallback,
-    redis: Redis,
+    cart_store: CartStore,
     db: AsyncSQLiteDatabase,
+    cart_renders: Debouncer,
 ):
-    (cart, product, size, _, product_key) = await getall(
-        callback, callback_data, redis, db
-    )
-    quantity = int(await redis.hget(cart.cart_key, product_key))
-
-    await cart.delete_product(product.id, size)
-    await cart.sub_price_amount(product.get_size_price(size) * quantity)
-
-    cart_amount = await cart.get_current_price_amount()
-    cart_items = await cart.get_cart_items()
-    await callback.message.edit_text(
-        "КОРЗИНА:",
-        reply_markup=await nav_kb.init_cart(cart_items, cart_amount),
-    )
+    (cart, product, size, _, _) = await getall(callback, callback_data, cart_store, db)
+    await cart.delete(product, size)
+    schedule_render(callback, cart, cart_renders)
 
 
 @cart_router.callback_query(CartCallback.filter(F.action == "erase_all"))
 async def cmd_erase_cart(
     callback: CallbackQuery,
-    redis: Redis,
+    cart_store: CartStore,
     db: AsyncSQLiteDatabase,
 ):
     user_id = callback.from_user.id
     user = await db.get_user_by_id(user_id)
-    cart = Cart(callback.from_user.id, redis, db)
+    cart = Cart(callback.from_user.id, cart_store, db)
 
     await cart.clear()
     await callback.message.edit_text(
         "Корзина была очищена.",
-        reply_markup=await nav_kb.main_menu(user),
+        reply_markup=nav_kb.main_menu(user),
     )
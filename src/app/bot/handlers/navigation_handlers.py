@@ -1,4 +1,4 @@
-from aiogram import F, Router
+from aiogram import F, Router, flags
 from aiogram.filters import CommandStart
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
@@ -11,10 +11,12 @@ from src.app.bot.core.callbacks import (
 )
 from src.app.bot.keyboards import nav_kb
 from src.app.bot.services.cart_service import Cart
+from src.app.bot.services.cart_store import CartStore
+from src.app.bot.services.user_service import register_user
 from src.app.database.models import Product
 from src.app.database.sqlite_db import AsyncSQLiteDatabase
 
-navigation_router = Router()
+navigation_router = Router(name="navigation")
 
 
 @navigation_router.callback_query(
@@ -22,29 +24,23 @@ navigation_router = Router()
 )
 @navigation_router.message(CommandStart())
 async def start(
-    event: Message | CallbackQuery, db: AsyncSQLiteDatabase, state: FSMContext
+    event: Message | CallbackQuery,
+    db: AsyncSQLiteDatabase,
+    redis: Redis,
+    state: FSMContext,
 ):
     await state.clear()
-    tg_user = event.from_user
-    if not (await db.get_user_by_id(event.from_user.id)):
-        db_user = await db.add_user(
-            user_id=tg_user.id,
-            username=tg_user.username,
-            first_name=tg_user.first_name,
-            last_name=tg_user.last_name,
-        )
-    else:
-        db_user = await db.update_user(tg_user)
+    db_user = await register_user(event.from_user, redis, db)
 
     if isinstance(event, CallbackQuery):
         await event.message.edit_text(
             f"Привет, {db_user.first_name}! Выбери пункт меню:",
-            reply_markup=await nav_kb.main_menu(db_user),
+            reply_markup=nav_kb.main_menu(db_user),
         )
     else:
         await event.answer(
             f"Привет, {db_user.first_name}! Выбери пункт меню:",
-            reply_markup=await nav_kb.main_menu(db_user),
+            reply_markup=nav_kb.main_menu(db_user),
         )
 
 
@@ -55,7 +51,7 @@ async def catalog_menu(
 ):
     await callback.message.edit_text(
         ("Для продолжения заказа выбери пункт меню:"),
-        reply_markup=(await nav_kb.catalog()),
+        reply_markup=nav_kb.catalog(),
     )
 
 
@@ -66,22 +62,24 @@ async def category_menu(
     callback: CallbackQuery,
     callback_data: CategoryNavigationCallback,
     db: AsyncSQLiteDatabase,
-    redis: Redis,
+    cart_store: CartStore,
 ):
     category = callback_data.action
-    products: list[Product] = await db.get_products_by_category(category)
-    cart = Cart(callback.from_user.id, redis, db)
+    catalog = await db.get_catalog()
+    products: list[Product] = catalog.by_category(category)
+    catalog_version = catalog.version
+    cart = Cart(callback.from_user.id, cart_store, db)
     cart_amount = await cart.get_current_price_amount()
     await callback.message.edit_text(
         (
             f"{'Стандарт: ~ 650 грамм, 29 см\nБольшая: ~ 850 грамм, 36 см\n\n' if category == 'pizza' else ''}{f'Общая стоимость корзины: {cart_amount:.2f} BYN\n\n' if cart_amount else ''}Для продолжения заказа выбери пункт меню:"
         ),
-        reply_markup=(await nav_kb.init_category_menu(products)),
+        reply_markup=nav_kb.init_category_menu(products, catalog_version),
     )
-    await callback.answer()
 
 
 @navigation_router.callback_query(MenuNavigationCallback.filter(F.action == "contacts"))
+@flags.callback_answer(disabled=True)
 async def menu_contacts(callback: CallbackQuery):
     await callback.answer(
         "Контакты:\n+375 (29) 111-22-33\n8 (800) 555-35-35", show_alert=True
@@ -91,6 +89,7 @@ async def menu_contacts(callback: CallbackQuery):
 @navigation_router.callback_query(
     ProductCallback.filter(F.action == "view_product_details")
 )
+@flags.callback_answer(disabled=True)
 async def product_info(
     callback: CallbackQuery, callback_data: ProductCallback, db: AsyncSQLiteDatabase
 ):
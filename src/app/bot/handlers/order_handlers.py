@@ -4,29 +4,54 @@ from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import CallbackQuery, Message
-from redis import Redis
 
 from src.app.bot.core.callbacks import (
     CartCallback,
     MenuNavigationCallback,
     OrderCallback,
 )
-from src.app.bot.keyboards import ord_kb
-from src.app.bot.services.cart_service import Cart
+from src.app.bot.keyboards import nav_kb, ord_kb
+from src.app.bot.services.cart_service import Cart, cart_total
+from src.app.bot.services.cart_store import CartStore
 from src.app.bot.utils.validators import validate_street_api
+from src.app.config.settings import settings
 from src.app.database.models import Product
 from src.app.database.sqlite_db import AsyncSQLiteDatabase
 
-order_router = Router()
+order_router = Router(name="order")
 
 
 @order_router.callback_query(MenuNavigationCallback.filter(F.action == "orders"))
-async def orders(callback: CallbackQuery, db: AsyncSQLiteDatabase):
+@order_router.callback_query(OrderCallback.filter(F.action == "orders_page"))
+async def orders(
+    callback: CallbackQuery,
+    callback_data: MenuNavigationCallback | OrderCallback,
+    db: AsyncSQLiteDatabase,
+):
     user_id = callback.from_user.id
-    orders = await db.get_orders_by_user(user_id)
+    cursor, backward = None, False
+    if isinstance(callback_data, OrderCallback):
+        cursor, backward = callback_data.cursor, callback_data.backward
+
+    page_size = settings.ORDERS_PAGE_SIZE
+    # запрашиваем на один заказ больше, чтобы узнать, есть ли следующая страница
+    orders = await db.get_orders_by_user(
+        user_id, cursor=cursor, limit=page_size + 1, backward=backward
+    )
+    if backward:
+        has_newer, has_older = len(orders) > page_size, True
+        orders = orders[-page_size:]
+    else:
+        has_newer, has_older = cursor is not None, len(orders) > page_size
+        orders = orders[:page_size]
+
     await callback.message.edit_text(
         "СПИСОК ЗАКАЗОВ:" if orders else "Список заказов пуст.",
-        reply_markup=await ord_kb.orders(orders),
+        reply_markup=await ord_kb.orders(
+            orders,
+            prev_cursor=orders[0].id if orders and has_newer else None,
+            next_cursor=orders[-1].id if orders and has_older else None,
+        ),
     )
 
 
@@ -35,11 +60,10 @@ async def order_details(
     callback: CallbackQuery, callback_data: OrderCallback, db: AsyncSQLiteDatabase
 ):
     order_id = callback_data.order_id
-    order = await db.get_order_by_id(order_id)
-    order_items = await db.get_order_items(order.id)
+    order = await db.get_order_full(order_id)
     order_items_text = []
-    for order_item in order_items:
-        product = await db.get_product_by_id(order_item.product_id)
+    for order_item in order.order_items:
+        product: Product = order_item.product
         emoji = product.emoji
         name = product.name
         size = order_item.size
@@ -225,14 +249,7 @@ async def apartment(message: Message, state: FSMContext):
     if apartment == "/skip":
         await state.update_data(apartment=None)
     else:
-        if not apartment.isdecimal():
-            await message.answer(
-                "ОФОРМЛЕНИЕ ЗАКАЗА\n\n❌ ОШИБКА! Номер квартиры должен быть от 1 до 1000.\nВведите номер квартиры или /skip для пропуска:",
-                reply_markup=await ord_kb.cancel_order(),
-            )
-            return
-
-        elif int(apartment) not in range(1, 1000):
+        if not apartment.isdecimal() or int(apartment) not in range(1, 1000):
             await message.answer(
                 "ОФОРМЛЕНИЕ ЗАКАЗА\n\n❌ ОШИБКА! Номер квартиры должен быть от 1 до 1000.\nВведите номер квартиры или /skip для пропуска:",
                 reply_markup=await ord_kb.cancel_order(),
@@ -306,7 +323,10 @@ async def enterance(message: Message, state: FSMContext):
 
 @order_router.message(OrderStates.additional_info)
 async def additional_info(
-    message: Message, state: FSMContext, redis: Redis, db: AsyncSQLiteDatabase
+    message: Message,
+    state: FSMContext,
+    cart_store: CartStore,
+    db: AsyncSQLiteDatabase,
 ):
     await state.update_data(
         additional_info=message.text if message.text != "/skip" else None
@@ -321,17 +341,23 @@ async def additional_info(
     enterance = data["enterance"]
     additional_info = data["additional_info"]
 
-    cart = Cart(message.from_user.id, redis, db)
-    cart_items = await cart.get_cart_items()
-    amount = await cart.get_current_price_amount()
+    cart = Cart(message.from_user.id, cart_store, db)
+    # корзина показывалась из снимков, перед заказом сверяем их с каталогом
+    cart_items, cart_changed = await cart.revalidate(await cart.get_cart_items())
+    if not cart_items:
+        await message.answer(
+            "ОФОРМЛЕНИЕ ЗАКАЗА\n\n❌ Товаров из корзины больше нет в меню.",
+            reply_markup=await nav_kb.init_cart(cart_items, 0),
+        )
+        await state.clear()
+        await cart.clear()
+        return
+    amount = cart_total(cart_items)
 
     cart_text = []
     for item in cart_items:
-        product, size, quantity = item
-        product: Product
-        price = product.get_size_price(size)
         cart_text.append(
-            f"{product.emoji} {product.name} {product.get_size_text(size)} - {quantity} шт. -- {(price * quantity):.2f} BYN\n"
+            f"{item.emoji} {item.name} {item.size_text} - {item.quantity} шт. -- {item.total / 100:.2f} BYN\n"
         )
         cart_text_normalized = "".join(cart_text)
 
@@ -354,6 +380,9 @@ async def additional_info(
     )
     message_parts = [
         f"⚠️ Сформирован заказ #{order.id}. Проверьте перед оплатой!\n",
+        "⚠️ Цены или состав корзины изменились, заказ сформирован по актуальному меню.\n"
+        if cart_changed
+        else "",
         cart_text_normalized,
         f"СТОИМОСТЬ {amount:.2f} BYN\n",
         client_text,
@@ -7,10 +7,10 @@ from src.app.bot.core.callbacks import AdminCallback, OrderCallback
 from src.app.bot.keyboards import nav_kb
 from src.app.config.logger import logger
 from src.app.config.settings import settings
-from src.app.database.models import OrderItem
+from src.app.database.models import Order
 from src.app.database.sqlite_db import AsyncSQLiteDatabase
 
-payment_router = Router()
+payment_router = Router(name="payment")
 
 
 @payment_router.callback_query(AdminCallback.filter(F.action == "test_payment"))
@@ -30,24 +30,24 @@ async def test_payment(callback: CallbackQuery):
     )
 
 
+def invoice_prices(order: Order) -> list[LabeledPrice]:
+    # Telegram принимает суммы только целыми копейками
+    return [
+        LabeledPrice(
+            label=f"{item.product.emoji} {item.product.name} {item.product.get_size_text(item.size)} -- {item.quantity} шт.",
+            amount=item.price_kopecks * item.quantity,
+        )
+        for item in order.order_items
+    ]
+
+
 @payment_router.callback_query(OrderCallback.filter(F.action == "confirm"))
 async def payment(
     callback: CallbackQuery, callback_data: OrderCallback, db: AsyncSQLiteDatabase
 ):
     order_id = callback_data.order_id
-    order = await db.get_order_by_id(order_id)
-    order_items = await db.get_order_items(order_id)
-    prices = []
-
-    for item in order_items:
-        item: OrderItem
-        product = await db.get_product_by_id(item.product_id)
-        prices.append(
-            LabeledPrice(
-                label=f"{product.emoji} {product.name} {product.get_size_text(item.size)} -- {item.quantity} шт.",
-                amount=item.price * item.quantity * 100,
-            )
-        )
+    order = await db.get_order_full(order_id)
+    prices = invoice_prices(order)
 
     if order.status == "pending":
         invoice_message = await callback.bot.send_invoice(
@@ -72,17 +72,17 @@ async def payment(
     elif order.status == "done":
         await callback.message.edit_text(
             f"✅ Заказ #{order.id} уже был оплачен. Ожидайте доставку.",
-            reply_markup=await nav_kb.main_menu(),
+            reply_markup=nav_kb.main_menu(),
         )
     elif order.status == "cancelled":
         await callback.message.edit_text(
             f"❌ Заказ #{order.id} был отменён. Оплата невозможна.",
-            reply_markup=await nav_kb.main_menu(),
+            reply_markup=nav_kb.main_menu(),
         )
     else:
         await callback.message.edit_text(
             "❌ Неизвестная ошибка. Попробуйте позже.",
-            reply_markup=await nav_kb.main_menu(),
+            reply_markup=nav_kb.main_menu(),
         )
 
 
@@ -98,7 +98,7 @@ async def delete_invoice_with_delay(
 
 @payment_router.pre_checkout_query()
 async def pre_checkout(pre_checkout_query: PreCheckoutQuery, db: AsyncSQLiteDatabase):
-    order_id = pre_checkout_query.invoice_payload.split("_")[-1]
+    order_id = int(pre_checkout_query.invoice_payload.split("_")[-1])
     order = await db.get_order_by_id(order_id)
     if order.status == "pending":
         await pre_checkout_query.bot.answer_pre_checkout_query(
@@ -123,10 +123,16 @@ async def pre_checkout(pre_checkout_query: PreCheckoutQuery, db: AsyncSQLiteData
 @payment_router.message(F.successful_payment)
 async def successful_payment(message: Message, db: AsyncSQLiteDatabase):
     payment = message.successful_payment
-    order_id = payment.invoice_payload.split("_")[-1]
-    await db.order_set_done(order_id)
+    order_id = int(payment.invoice_payload.split("_")[-1])
+    if not await db.order_set_done(order_id):
+        # повторная доставка апдейта или заказ уже не ожидает оплаты
+        logger.warning(
+            f"Оплата заказа #{order_id} не изменила статус "
+            f"(charge_id {payment.telegram_payment_charge_id})"
+        )
+        return
 
     await message.answer(
         '✅ Оплата прошла успешно! Ваш заказ готовится.\nПосмотреть статус заказа можно в меню "Мои заказы"',
-        reply_markup=await nav_kb.main_menu(),
+        reply_markup=nav_kb.main_menu(),
     )
@@ -1,11 +1,16 @@
-from aiogram.types import InlineKeyboardButton
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from src.app.bot.core.callbacks import AdminCallback, MenuNavigationCallback
+from src.app.bot.keyboards.markup_cache import markup_cache
 from src.app.database.sqlite_db import Product, User
 
 
-async def admin():
+def admin() -> InlineKeyboardMarkup:
+    return markup_cache.get_or_build("admin", build_admin)
+
+
+def build_admin() -> InlineKeyboardMarkup:
     keyboard = InlineKeyboardBuilder()
     keyboard.add(
         InlineKeyboardButton(
@@ -17,6 +22,12 @@ async def admin():
         InlineKeyboardButton(
             text="❌ Удалить продукт", callback_data=AdminCallback.DELETE_PRODUCTS()
         ),
+        InlineKeyboardButton(
+            text="📊 Отчёт", callback_data=AdminCallback.SALES_REPORT()
+        ),
+        InlineKeyboardButton(
+            text="📨 Рассылка", callback_data=AdminCallback.BROADCAST()
+        ),
         InlineKeyboardButton(
             text="🛑 Права суперпользователя 🛑",
             callback_data=AdminCallback.ADMIN_LIST(),
@@ -106,7 +117,14 @@ async def admin_list(admins: list[User], callback_user: User):
     return keyboard.adjust(1).as_markup()
 
 
-async def product_delete(products: list[Product]):
+def product_delete(
+    products: list[Product], catalog_version: int
+) -> InlineKeyboardMarkup:
+    key = ("product_delete", catalog_version)
+    return markup_cache.get_or_build(key, lambda: build_product_delete(products))
+
+
+def build_product_delete(products: list[Product]) -> InlineKeyboardMarkup:
     keyboard = InlineKeyboardBuilder()
     for product in products:
         keyboard.add(
@@ -139,7 +157,12 @@ async def confirm_deleting_product(product_id: int):
     return keyboard.as_markup()
 
 
-async def product_edit(products: list[Product]):
+def product_edit(products: list[Product], catalog_version: int) -> InlineKeyboardMarkup:
+    key = ("product_edit", catalog_version)
+    return markup_cache.get_or_build(key, lambda: build_product_edit(products))
+
+
+def build_product_edit(products: list[Product]) -> InlineKeyboardMarkup:
     keyboard = InlineKeyboardBuilder()
     for product in products:
         keyboard.add(
@@ -216,3 +239,40 @@ async def back_to_admin_list(can_dismiss, admin_id):
         InlineKeyboardButton(text="⬅️ Назад", callback_data=AdminCallback.ADMIN_LIST())
     )
     return keyboard.adjust(1).as_markup()
+
+
+async def sales_report():
+    keyboard = InlineKeyboardBuilder()
+    keyboard.add(
+        InlineKeyboardButton(
+            text="⬅️ Назад", callback_data=MenuNavigationCallback.ADMIN()
+        ),
+    )
+    return keyboard.adjust(1).as_markup()
+
+
+async def broadcast_confirm():
+    keyboard = InlineKeyboardBuilder()
+    keyboard.add(
+        InlineKeyboardButton(
+            text="✅ Отправить всем", callback_data=AdminCallback.BROADCAST_CONFIRM()
+        ),
+        InlineKeyboardButton(
+            text="🛑 Отмена", callback_data=MenuNavigationCallback.ADMIN()
+        ),
+    )
+    return keyboard.adjust(1).as_markup()
+
+
+async def broadcast_progress():
+    keyboard = InlineKeyboardBuilder()
+    keyboard.add(
+        InlineKeyboardButton(
+            text="🛑 Остановить рассылку",
+            callback_data=AdminCallback.BROADCAST_CANCEL(),
+        ),
+        InlineKeyboardButton(
+            text="⬅️ Назад", callback_data=MenuNavigationCallback.ADMIN()
+        ),
+    )
+    return keyboard.adjust(1).as_markup()
@@ -0,0 +1,35 @@
+from collections.abc import Callable, Hashable
+
+from aiogram.types import InlineKeyboardMarkup
+
+
+class MarkupCache:
+    """
+    Готовые InlineKeyboardMarkup для статичных клавиатур и клавиатур каталога.
+
+    Сборка клавиатуры упаковывает CallbackData каждой кнопки через pydantic,
+    поэтому один раз собранная разметка отдаётся во все ответы (её никто
+    не изменяет). Для клавиатур каталога версия каталога входит в ключ:
+    после изменения товаров ключи меняются, а старые записи вытесняются.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: dict[Hashable, InlineKeyboardMarkup] = {}
+
+    def get_or_build(
+        self, key: Hashable, build: Callable[[], InlineKeyboardMarkup]
+    ) -> InlineKeyboardMarkup:
+        markup = self._data.get(key)
+        if markup is None:
+            if len(self._data) >= self.maxsize:
+                # вытесняем самую старую запись
+                self._data.pop(next(iter(self._data)))
+            markup = self._data[key] = build()
+        return markup
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+markup_cache = MarkupCache()
@@ -1,6 +1,4 @@
-from typing import Literal
-
-from aiogram.types import InlineKeyboardButton
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from src.app.bot.core.callbacks import (
@@ -9,10 +7,18 @@ from src.app.bot.core.callbacks import (
     MenuNavigationCallback,
     ProductCallback,
 )
+from src.app.bot.keyboards.markup_cache import markup_cache
 from src.app.database.sqlite_db import Product, User
 
 
-async def main_menu(user: User):
+def main_menu(user: User | None = None) -> InlineKeyboardMarkup:
+    is_admin = bool(user and user.is_admin)
+    return markup_cache.get_or_build(
+        ("main_menu", is_admin), lambda: build_main_menu(is_admin)
+    )
+
+
+def build_main_menu(is_admin: bool) -> InlineKeyboardMarkup:
     keyboard = InlineKeyboardBuilder()
     keyboard.add(
         InlineKeyboardButton(
@@ -29,7 +35,7 @@ async def main_menu(user: User):
         ),
     )
     keyboard.adjust(1, 1, 2, 1)
-    if user.is_admin:
+    if is_admin:
         keyboard.row(
             InlineKeyboardButton(
                 text="👺 АДМИНПАНЕЛЬ", callback_data=MenuNavigationCallback.ADMIN()
@@ -38,7 +44,11 @@ async def main_menu(user: User):
     return keyboard.as_markup()
 
 
-async def catalog():
+def catalog() -> InlineKeyboardMarkup:
+    return markup_cache.get_or_build("catalog", build_catalog)
+
+
+def build_catalog() -> InlineKeyboardMarkup:
     keyboard = InlineKeyboardBuilder()
     keyboard.add(
         InlineKeyboardButton(
@@ -57,7 +67,15 @@ async def catalog():
     return keyboard.adjust(1, 2, 1).as_markup()
 
 
-async def init_category_menu(products: list[Product]):
+def init_category_menu(
+    products: list[Product], catalog_version: int
+) -> InlineKeyboardMarkup:
+    """catalog_version - версия каталога, из которого взяты products."""
+    key = ("category_menu", catalog_version, tuple(p.id for p in products))
+    return markup_cache.get_or_build(key, lambda: build_category_menu(products))
+
+
+def build_category_menu(products: list[Product]) -> InlineKeyboardMarkup:
     keyboard = InlineKeyboardBuilder()
     for product in products:
         name_btn = InlineKeyboardButton(
@@ -93,26 +111,28 @@ async def init_cart(cart_items: tuple, cart_amount: float):
     keyboard = InlineKeyboardBuilder()
 
     if cart_items and cart_amount:
-        for product, product_size, quantity in cart_items:
-            product: Product
-            product_size: Literal["small", "large"]
-            quantity: str
-            price_by_count = product.get_size_price(product_size) * int(quantity)
+        for item in cart_items:
+            product_id, product_size, quantity = (
+                item.product_id,
+                item.size,
+                item.quantity,
+            )
+            price_by_count = item.total / 100
             keyboard.row(
                 InlineKeyboardButton(
-                    text=f"{product.emoji} {product.name} {product.get_size_text(product_size)} - {quantity} шт -- {price_by_count:.2f} BYN",
-                    callback_data=ProductCallback.view_product_details(product.id),
+                    text=f"{item.emoji} {item.name} {item.size_text} - {quantity} шт -- {price_by_count:.2f} BYN",
+                    callback_data=ProductCallback.view_product_details(product_id),
                 )
             )
             keyboard.row(
                 InlineKeyboardButton(
                     text="+1",
-                    callback_data=CartCallback.increase(product.id, product_size),
+                    callback_data=CartCallback.increase(product_id, product_size),
                 ),
                 InlineKeyboardButton(
                     text="-1",
                     callback_data=(
-                        CartCallback.decrease(product.id, product_size)
+                        CartCallback.decrease(product_id, product_size)
                         if int(quantity) > 1 or len(cart_items) > 1
                         else CartCallback.ERASE_ALL()
                     ),
@@ -120,7 +140,7 @@ async def init_cart(cart_items: tuple, cart_amount: float):
                 InlineKeyboardButton(
                     text="❌",
                     callback_data=(
-                        CartCallback.delete(product.id, product_size)
+                        CartCallback.delete(product_id, product_size)
                         if len(cart_items) > 1
                         else CartCallback.ERASE_ALL()
                     ),
@@ -5,7 +5,14 @@ from src.app.bot.core.callbacks import MenuNavigationCallback, OrderCallback
 from src.app.database.sqlite_db import Order
 
 
-async def orders(orders: list[Order]):
+async def orders(
+    orders: list[Order], prev_cursor: int | None = None, next_cursor: int | None = None
+):
+    """
+    prev_cursor - id заказа для перехода к более новым заказам
+
+    next_cursor - id заказа для перехода к более старым заказам
+    """
     keyboard = InlineKeyboardBuilder()
     mark = {"done": "✅", "pending": "⚠️", "cancelled": "❌"}
     for order in orders:
@@ -16,6 +23,21 @@ async def orders(orders: list[Order]):
             )
         )
     keyboard.adjust(1)
+    pages = []
+    if prev_cursor is not None:
+        pages.append(
+            InlineKeyboardButton(
+                text="◀️ Новее", callback_data=OrderCallback.orders_prev(prev_cursor)
+            )
+        )
+    if next_cursor is not None:
+        pages.append(
+            InlineKeyboardButton(
+                text="Старше ▶️", callback_data=OrderCallback.orders_next(next_cursor)
+            )
+        )
+    if pages:
+        keyboard.row(*pages)
     if not orders:
         keyboard.row(
             InlineKeyboardButton(
@@ -1,30 +1,27 @@
 import asyncio
 
-from aiogram import Bot, Dispatcher
 from dotenv import load_dotenv
 
-from src.app.bot.handlers.handlers_routers import routers
+from src.app.bot.dispatcher import create_bot, create_dispatcher
+from src.app.bot.metrics import start_metrics_server
+from src.app.bot.webhook import run_webhook
 from src.app.config.logger import logger, setup_logging
 from src.app.config.settings import settings
-from src.app.database.redis_db import init_redis
-from src.app.database.sqlite_db import init_async_sqlite
 
 
 async def main():
     load_dotenv()
     setup_logging()
     logger.info("Логирование бота запущено")
-    bot = Bot(settings.BOT_TOKEN)
-    dp = Dispatcher()
-    redis = await init_redis()
-    sqlite_db = await init_async_sqlite()
-    dp["redis"] = redis
-    dp["db"] = sqlite_db
-    dp.include_routers(*routers)
-    logger.info("Все сервисы запущены")
+    dp = await create_dispatcher()
+    bot = create_bot(dp["redis"])
+    start_metrics_server()
     logger.info("FastAPI доступен по адресу http://localhost:8000/")
-    await dp.start_polling(bot)
+    await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if settings.BOT_MODE == "webhook":
+        run_webhook()
+    else:
+        asyncio.run(main())
@@ -0,0 +1,33 @@
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+from src.app.config.logger import logger
+from src.app.config.settings import settings
+
+# метрики процесса бота; у API свои (api/metrics.py), чтобы каждый процесс
+# отдавал только то, что сам обновляет
+
+# задержка обработки апдейта целиком (outer middleware), p50/p99 -
+# histogram_quantile(0.99, sum by (le, handler) (rate(bot_update_seconds_bucket[5m])))
+UPDATE_SECONDS = Histogram(
+    "bot_update_seconds",
+    "Время обработки апдейта",
+    ["router", "handler"],
+)
+UPDATE_ERRORS = Counter(
+    "bot_update_errors_total",
+    "Апдейты, обработка которых завершилась исключением",
+    ["router", "handler", "error"],
+)
+UPDATES_IN_FLIGHT = Gauge("bot_updates_in_flight", "Апдейты в обработке")
+RATE_LIMIT_QUEUE = Gauge(
+    "bot_rate_limit_queue_depth", "Запросы к Bot API, ждущие лимита"
+)
+
+
+def start_metrics_server(worker: int = 0) -> None:
+    """/metrics процесса бота; воркеры webhook слушают METRICS_PORT + номер воркера."""
+    if not settings.METRICS_PORT:
+        return
+    port = settings.METRICS_PORT + worker
+    start_http_server(port, addr=settings.METRICS_HOST)
+    logger.info(f"Метрики Prometheus: http://{settings.METRICS_HOST}:{port}/metrics")
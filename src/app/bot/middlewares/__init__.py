@@ -0,0 +1,19 @@
+from src.app.bot.middlewares.admin import AdminOnlyMiddleware
+from src.app.bot.middlewares.callback_answer import CallbackAnswerMiddleware
+from src.app.bot.middlewares.debounce import CancelDebouncedMiddleware
+from src.app.bot.middlewares.edit_dedup import SkipUnchangedEditMiddleware
+from src.app.bot.middlewares.metrics import (
+    HandlerLabelMiddleware,
+    UpdateMetricsMiddleware,
+)
+from src.app.bot.middlewares.rate_limit import RateLimitMiddleware
+
+__all__ = [
+    "AdminOnlyMiddleware",
+    "CallbackAnswerMiddleware",
+    "CancelDebouncedMiddleware",
+    "HandlerLabelMiddleware",
+    "RateLimitMiddleware",
+    "SkipUnchangedEditMiddleware",
+    "UpdateMetricsMiddleware",
+]
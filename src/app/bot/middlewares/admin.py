@@ -0,0 +1,35 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from src.app.bot.keyboards import nav_kb
+from src.app.config.logger import logger
+
+
+class AdminOnlyMiddleware(BaseMiddleware):
+    """
+    Inner middleware админского роутера: права проверяются по БД на каждый
+    апдейт. Данные callback приходят от клиента и могут быть подделаны, поэтому
+    наличия кнопки в меню недостаточно.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user_id = data["event_from_user"].id
+        user = await data["db"].get_user_by_id(user_id)
+        if user is not None and user.is_admin:
+            return await handler(event, data)
+
+        logger.warning(f"Отказ в доступе к админке пользователю {user_id}")
+        await data["state"].clear()
+        text = "Я умею отвечать только на меню. Выбери пункт ниже:"
+        if isinstance(event, CallbackQuery):
+            await event.message.edit_text(text, reply_markup=nav_kb.main_menu(user))
+        elif isinstance(event, Message):
+            await event.answer(text, reply_markup=nav_kb.main_menu(user))
@@ -0,0 +1,46 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, TelegramObject
+
+from src.app.config.logger import logger
+
+
+class CallbackAnswerMiddleware(BaseMiddleware):
+    """
+    Отвечает на callback query сразу, параллельно с обработчиком, чтобы
+    индикатор загрузки на кнопке пропадал, не дожидаясь edit_text и запросов к БД.
+
+    Обработчики, которые отвечают сами (alert с текстом), отключают автоответ
+    флагом: @flags.callback_answer(disabled=True).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        flag = get_flag(data, "callback_answer")
+        if not isinstance(event, CallbackQuery) or (
+            isinstance(flag, dict) and flag.get("disabled")
+        ):
+            return await handler(event, data)
+
+        answer = asyncio.create_task(self.answer(event))
+        try:
+            return await handler(event, data)
+        finally:
+            await answer
+
+    @staticmethod
+    async def answer(callback: CallbackQuery) -> None:
+        try:
+            await callback.answer()
+        except TelegramBadRequest as e:
+            # запрос устарел (бот был недоступен) - отвечать уже не нужно
+            logger.debug(f"Не удалось ответить на callback {callback.id}: {e}")
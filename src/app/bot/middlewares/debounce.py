@@ -0,0 +1,31 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import CallbackQuery, TelegramObject
+
+from src.app.bot.services.debounce import Debouncer
+
+
+class CancelDebouncedMiddleware(BaseMiddleware):
+    """
+    Inner middleware на dp.callback_query: любая другая кнопка пользователя
+    отменяет его отложенную перерисовку, иначе она затёрла бы новый экран
+    (например, "Оформить заказ" сразу после "+1").
+
+    Обработчики, которые сами откладывают перерисовку, помечены @flags.debounced.
+    """
+
+    def __init__(self, debouncer: Debouncer):
+        self.debouncer = debouncer
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if isinstance(event, CallbackQuery) and not get_flag(data, "debounced"):
+            self.debouncer.cancel(event.from_user.id)
+        return await handler(event, data)
@@ -0,0 +1,102 @@
+import hashlib
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import (
+    DeleteMessage,
+    EditMessageCaption,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    Response,
+    TelegramMethod,
+)
+from aiogram.methods.base import TelegramType
+from redis.asyncio import Redis
+
+from src.app.config.logger import logger
+
+NOT_MODIFIED = "message is not modified"
+# меняют сообщение в обход отпечатка
+INVALIDATING_METHODS = (
+    EditMessageReplyMarkup,
+    EditMessageCaption,
+    EditMessageMedia,
+    DeleteMessage,
+)
+
+
+def edit_key(method: TelegramMethod) -> str | None:
+    if getattr(method, "inline_message_id", None):
+        return f"edit_fp:inline:{method.inline_message_id}"
+    if method.chat_id is None or method.message_id is None:
+        return None
+    return f"edit_fp:{method.chat_id}:{method.message_id}"
+
+
+def edit_fingerprint(method: EditMessageText) -> str:
+    markup = method.reply_markup.model_dump_json() if method.reply_markup else ""
+    preview = repr(method.link_preview_options)
+    entities = [entity.model_dump_json() for entity in method.entities or ()]
+    content = "\x00".join(
+        (method.text, repr(method.parse_mode), preview, markup, *entities)
+    )
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+class SkipUnchangedEditMiddleware(BaseRequestMiddleware):
+    """
+    Пропускает EditMessageText, если текст и клавиатура совпадают с тем, что
+    уже показано в сообщении. Отпечаток последнего отправленного содержимого
+    хранится в Redis по chat_id и message_id (SET ... GET: одна команда на правку).
+    Пропущенная правка не расходует лимит Bot API, поэтому middleware
+    регистрируется раньше RateLimitMiddleware.
+    """
+
+    def __init__(self, redis: Redis, ttl: int = 3600):
+        self.redis = redis
+        self.ttl = ttl
+        self.skipped = 0
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if isinstance(method, INVALIDATING_METHODS):
+            key = edit_key(method)
+            if key is not None:
+                await self.redis.delete(key)
+            return await make_request(bot, method)
+        if not isinstance(method, EditMessageText):
+            return await make_request(bot, method)
+        key = edit_key(method)
+        if key is None:
+            return await make_request(bot, method)
+
+        fingerprint = edit_fingerprint(method)
+        previous = await self.redis.set(key, fingerprint, ex=self.ttl, get=True)
+        if previous == fingerprint:
+            self.skipped += 1
+            return Response[TelegramType](ok=True, result=True)
+        applied = False
+        try:
+            response = await make_request(bot, method)
+            applied = True
+            return response
+        except TelegramBadRequest as e:
+            if NOT_MODIFIED not in e.message:
+                raise
+            logger.debug(f"Сообщение {key} не изменилось")
+            applied = True
+            return Response[TelegramType](ok=True, result=True)
+        finally:
+            # ошибка или отмена (в том числе в очереди лимита): правка не показана,
+            # отпечаток не должен пропустить её повтор
+            if not applied:
+                await self.redis.delete(key)
@@ -0,0 +1,53 @@
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from src.app.bot.metrics import UPDATE_ERRORS, UPDATE_SECONDS, UPDATES_IN_FLIGHT
+
+UNHANDLED_LABELS = {"router": "", "handler": "unhandled"}
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """
+    Outer middleware на dp.update: время, ошибки и число апдейтов в обработке.
+
+    Какой обработчик сработал, известно только внутри роутера, поэтому
+    HandlerLabelMiddleware (inner) записывает его имя в общий словарь data["metrics"].
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        labels = data["metrics"] = dict(UNHANDLED_LABELS)
+        UPDATES_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception as e:
+            UPDATE_ERRORS.labels(error=type(e).__name__, **labels).inc()
+            raise
+        finally:
+            UPDATE_SECONDS.labels(**labels).observe(time.perf_counter() - started)
+            UPDATES_IN_FLIGHT.dec()
+
+
+class HandlerLabelMiddleware(BaseMiddleware):
+    """Inner middleware: имя роутера и обработчика для UpdateMetricsMiddleware."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        labels = data.get("metrics")
+        if labels is not None:
+            labels["router"] = data["event_router"].name
+            labels["handler"] = data["handler"].callback.__name__
+        return await handler(event, data)
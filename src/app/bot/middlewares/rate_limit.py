@@ -0,0 +1,123 @@
+import asyncio
+import random
+import time
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from src.app.config.logger import logger
+from src.app.database.ttl_cache import TTLCache
+
+
+class TokenBucket:
+    """Не больше rate запросов в секунду в среднем и capacity подряд."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        # asyncio.Lock честный (FIFO): ожидающие запросы уходят в порядке поступления
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def block(self, seconds: float) -> None:
+        """Приостанавливает выдачу токенов, например после RetryAfter."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Ограничение исходящих запросов к Bot API на уровне сессии бота.
+
+    Запросы с chat_id (отправка и редактирование сообщений, инвойсы...) проходят
+    через token bucket своего чата и общий bucket бота: при превышении лимита
+    запрос ждёт в очереди, а не падает. На TelegramRetryAfter запрос повторяется
+    после паузы с джиттером, пауза распространяется на весь чат.
+    Лимиты действуют в пределах одного процесса, поэтому при нескольких воркерах
+    webhook global_rate - доля воркера (см. create_bot).
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 30,
+        global_burst: int = 30,
+        chat_rate: float = 1,
+        chat_burst: int = 3,
+        max_retries: int = 3,
+        retry_jitter: float = 1.0,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        # bucket простаивающего чата восстанавливается за capacity / rate секунд
+        self.chat_buckets = TTLCache(ttl=max(60, chat_burst / chat_rate))
+        self.max_retries = max_retries
+        self.retry_jitter = retry_jitter
+        self.queue_depth = 0  # запросов, ожидающих токен
+
+    def chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.chat_rate, self.chat_burst)
+        self.chat_buckets.set(chat_id, bucket)
+        return bucket
+
+    async def wait(self, bucket: TokenBucket) -> None:
+        self.queue_depth += 1
+        try:
+            await bucket.acquire()
+            await self.global_bucket.acquire()
+        finally:
+            self.queue_depth -= 1
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        bucket = self.chat_bucket(chat_id) if chat_id is not None else None
+        attempt = 0
+        while True:
+            if bucket is not None:
+                await self.wait(bucket)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                delay = e.retry_after + random.uniform(0, self.retry_jitter) * attempt
+                logger.warning(
+                    f"Telegram просит подождать {e.retry_after} с "
+                    f"({method.__api_method__}), повтор #{attempt} через {delay:.1f} с"
+                )
+                if bucket is not None:
+                    bucket.block(delay)
+                else:
+                    await asyncio.sleep(delay)
@@ -0,0 +1,198 @@
+import asyncio
+import time
+from uuid import uuid4
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError
+from redis.asyncio import Redis
+
+from src.app.bot.middlewares.rate_limit import TokenBucket
+from src.app.bot.services.user_service import profile_key
+from src.app.config.logger import logger
+from src.app.database.sqlite_db import AsyncSQLiteDatabase
+
+ACTIVE_KEY = "broadcast:active"
+FAILURES_LIMIT = 1000
+
+
+def broadcast_key(broadcast_id: str) -> str:
+    return f"broadcast:{broadcast_id}"
+
+
+class BroadcastService:
+    """
+    Рассылка сообщения администратора всем пользователям в фоновой задаче.
+
+    id пользователей читаются из БД пачками (keyset по id), сообщение копируется
+    каждому не быстрее rate в секунду, чтобы оставить запас лимита Bot API для
+    ответов пользователям. После каждой пачки прогресс (курсор, счётчики, ошибки)
+    пишется в Redis hash broadcast:{id}, поэтому после перезапуска рассылка
+    продолжается с последней пачки. Одновременно рассылку ведёт только один
+    воркер - тот, кто взял блокировку broadcast:{id}:lock.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        db: AsyncSQLiteDatabase,
+        chunk_size: int = 100,
+        rate: float = 25,
+        lock_ttl: int = 60,
+    ):
+        self.redis = redis
+        self.db = db
+        self.chunk_size = chunk_size
+        self.bucket = TokenBucket(rate, capacity=1)
+        self.lock_ttl = lock_ttl
+        self._task: asyncio.Task | None = None
+        self._task_id: str | None = None
+
+    async def start(self, bot: Bot, from_chat_id: int, message_id: int) -> str | None:
+        """Запускает рассылку; None, если предыдущая ещё не закончилась."""
+        total = await self.db.count_active_users()
+        broadcast_id = str(time.time_ns())
+        # SET NX - проверка и захват одной командой: два администратора (или два
+        # воркера) не запустят параллельные рассылки
+        if not await self.redis.set(ACTIVE_KEY, broadcast_id, nx=True):
+            return None
+        await self.redis.hset(
+            broadcast_key(broadcast_id),
+            mapping={
+                "status": "running",
+                "from_chat_id": from_chat_id,
+                "message_id": message_id,
+                "cursor": 0,
+                "total": total,
+                "sent": 0,
+                "blocked": 0,
+                "failed": 0,
+            },
+        )
+        self._spawn(bot, broadcast_id)
+        return broadcast_id
+
+    async def resume(self, bot: Bot) -> None:
+        """Продолжает незаконченную рассылку после перезапуска бота."""
+        if await self.progress() is not None:
+            self._spawn(bot, await self.redis.get(ACTIVE_KEY))
+
+    async def progress(self) -> dict[str, str] | None:
+        """Состояние текущей рассылки или None, если рассылка не идёт."""
+        broadcast_id = await self.redis.get(ACTIVE_KEY)
+        if broadcast_id is None:
+            return None
+        state = await self.redis.hgetall(broadcast_key(broadcast_id))
+        if state.get("status") != "running":
+            return None
+        return state
+
+    async def cancel(self) -> None:
+        broadcast_id = await self.redis.get(ACTIVE_KEY)
+        if broadcast_id is not None:
+            await self.redis.hset(broadcast_key(broadcast_id), "status", "cancelled")
+            await self.redis.delete(ACTIVE_KEY)
+        # не ждём конца текущей пачки: иначе новая рассылка, запущенная сразу
+        # после отмены, осталась бы без задачи (см. _spawn)
+        await self.stop()
+
+    async def stop(self) -> None:
+        """Останавливает задачу при выключении бота, прогресс остаётся в Redis."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def _spawn(self, bot: Bot, broadcast_id: str) -> None:
+        if self._task is not None and not self._task.done():
+            if self._task_id == broadcast_id:
+                return
+            # прежняя рассылка уже не активна (отменена в другом воркере)
+            self._task.cancel()
+        self._task_id = broadcast_id
+        self._task = asyncio.create_task(self._run(bot, broadcast_id))
+
+    async def _run(self, bot: Bot, broadcast_id: str) -> None:
+        key = broadcast_key(broadcast_id)
+        lock_key = f"{key}:lock"
+        token = uuid4().hex
+        if not await self.redis.set(lock_key, token, nx=True, ex=self.lock_ttl):
+            # рассылку уже ведёт другой воркер
+            return
+        try:
+            await self._send_all(bot, key, lock_key)
+        except Exception as e:
+            logger.error(f"Ошибка рассылки {broadcast_id}: {e}")
+            # без воркера "running" рассылка блокировала бы запуск следующих
+            await self.redis.hset(key, "status", "failed")
+            if await self.redis.get(ACTIVE_KEY) == broadcast_id:
+                await self.redis.delete(ACTIVE_KEY)
+        finally:
+            if await self.redis.get(lock_key) == token:
+                await self.redis.delete(lock_key)
+
+    async def _send_all(self, bot: Bot, key: str, lock_key: str) -> None:
+        state = await self.redis.hgetall(key)
+        from_chat_id = int(state["from_chat_id"])
+        message_id = int(state["message_id"])
+        cursor = int(state["cursor"])
+        logger.info(f"Рассылка {key} идёт с id {cursor}")
+
+        while True:
+            if await self.redis.hget(key, "status") != "running":
+                logger.info(f"Рассылка {key} остановлена")
+                return
+            user_ids = await self.db.get_user_ids_chunk(cursor, self.chunk_size)
+            if not user_ids:
+                break
+            results = await asyncio.gather(
+                *(
+                    self._send(bot, user_id, from_chat_id, message_id)
+                    for user_id in user_ids
+                ),
+                return_exceptions=True,
+            )
+            blocked = [
+                user_id
+                for user_id, result in zip(user_ids, results)
+                if isinstance(result, TelegramForbiddenError)
+            ]
+            failures = [
+                f"{user_id}: {result}"
+                for user_id, result in zip(user_ids, results)
+                if isinstance(result, Exception)
+                and not isinstance(result, TelegramForbiddenError)
+            ]
+            if blocked:
+                await self.db.mark_users_blocked(blocked)
+            cursor = user_ids[-1]
+
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(key, "cursor", cursor)
+                pipe.hincrby(key, "sent", len(user_ids) - len(blocked) - len(failures))
+                pipe.hincrby(key, "blocked", len(blocked))
+                pipe.hincrby(key, "failed", len(failures))
+                if failures:
+                    pipe.rpush(f"{key}:failures", *failures)
+                    pipe.ltrim(f"{key}:failures", -FAILURES_LIMIT, -1)
+                if blocked:
+                    # при следующем /start профиль перезапишется и снимет блокировку
+                    pipe.delete(*(profile_key(user_id) for user_id in blocked))
+                pipe.expire(lock_key, self.lock_ttl)
+                await pipe.execute()
+
+        await self.redis.hset(key, "status", "done")
+        await self.redis.delete(ACTIVE_KEY)
+        state = await self.redis.hgetall(key)
+        logger.info(f"Рассылка {key} завершена: {state}")
+        await bot.send_message(
+            from_chat_id,
+            f"РАССЫЛКА ЗАВЕРШЕНА\n\nДоставлено: {state['sent']}\n"
+            f"Заблокировали бота: {state['blocked']}\nОшибок: {state['failed']}",
+        )
+
+    async def _send(
+        self, bot: Bot, user_id: int, from_chat_id: int, message_id: int
+    ) -> None:
+        await self.bucket.acquire()
+        await bot.copy_message(
+            chat_id=user_id, from_chat_id=from_chat_id, message_id=message_id
+        )
@@ -1,80 +1,200 @@
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+
 from aiogram.types import CallbackQuery
-from redis.asyncio import Redis
 
 from src.app.bot.core.callbacks import ProductCallback
+from src.app.bot.services.cart_store import CartStore
+from src.app.config.constants import CATEGORY_ORDER
+from src.app.config.settings import settings
+from src.app.database.models import Product
 from src.app.database.sqlite_db import AsyncSQLiteDatabase
 
 
+def to_minor(price: float) -> int:
+    """BYN -> копейки."""
+    return round(price * 100)
+
+
+@dataclass(slots=True)
+class CartItem:
+    """Позиция корзины - снимок продукта на момент последнего изменения позиции."""
+
+    product_id: int
+    size: str
+    quantity: int
+    price: int  # цена за штуку в копейках
+    name: str
+    emoji: str
+    category: str
+    size_text: str
+    catalog_version: str
+
+    @classmethod
+    def from_product(
+        cls, product: Product, size: str, quantity: int, catalog_version: int = 0
+    ) -> "CartItem":
+        """Позиция по текущим данным каталога."""
+        return cls(
+            product_id=product.id,
+            size=size,
+            quantity=quantity,
+            price=to_minor(product.get_size_price(size)),
+            name=product.name,
+            emoji=product.emoji,
+            category=product.category,
+            size_text=product.get_size_text(size),
+            catalog_version=str(catalog_version),
+        )
+
+    @property
+    def key(self) -> str:
+        return f"product:{self.product_id}:{self.size}"
+
+    @property
+    def total(self) -> int:
+        return self.price * self.quantity
+
+    def snapshot(self) -> str:
+        """JSON для hash корзины без количества, его проставляет Lua-скрипт."""
+        return json.dumps(
+            {
+                "p": self.price,
+                "n": self.name,
+                "e": self.emoji,
+                "c": self.category,
+                "s": self.size_text,
+                "v": self.catalog_version,
+            },
+            ensure_ascii=False,
+        )
+
+
+def parse_cart(raw_items: dict[str, str]) -> tuple[CartItem, ...]:
+    """Содержимое hash корзины -> позиции, отсортированные как в меню."""
+    items = []
+    for item_key, raw in raw_items.items():
+        _, product_id, size = item_key.split(":")
+        try:
+            line = json.loads(raw)
+            item = CartItem(
+                product_id=int(product_id),
+                size=size,
+                quantity=int(line["q"]),
+                price=int(line["p"]),
+                name=line["n"],
+                emoji=line["e"],
+                category=line["c"],
+                size_text=line["s"],
+                catalog_version=line["v"],
+            )
+        except (ValueError, TypeError, KeyError):
+            # позиции старого формата пропускаем, такие корзины истекут по TTL
+            continue
+        items.append(item)
+    return sort_cart(items)
+
+
+def sort_cart(items: Iterable[CartItem]) -> tuple[CartItem, ...]:
+    return tuple(
+        sorted(items, key=lambda x: (CATEGORY_ORDER.index(x.category), x.name))
+    )
+
+
+def cart_total(items: Iterable[CartItem]) -> float:
+    """Сумма корзины в BYN, считается в копейках без накопления погрешности."""
+    return sum(item.total for item in items) / 100
+
+
 class Cart:
-    def __init__(self, user_id: int, redis: Redis, db: AsyncSQLiteDatabase):
+    """
+    Корзина пользователя.
+
+    Каждая позиция хранит снимок продукта (название, эмодзи, цену...), поэтому
+    корзина и её сумма показываются одним чтением из CartStore без обращения к БД.
+    С каталогом снимки сверяются только при оформлении заказа (revalidate).
+    """
+
+    def __init__(self, user_id: int, store: CartStore, db: AsyncSQLiteDatabase):
         self.user_id = user_id
         self.db = db
-        self.redis = redis
+        self.store = store
         self.cart_key = f"cart:{user_id}"
-        self.amount_key = f"cart_amount:{user_id}"
-
-    async def get_cart_items(self):
-        dict_cart_items: dict[str, str] = await self.redis.hgetall(self.cart_key)
-        cart_items = []
-        for item_key, quantity in dict_cart_items.items():
-            _, product_id, size = item_key.split(":")
-            quantity = int(quantity)
-            product = await self.db.get_product_by_id(product_id)
-            cart_items.append((product, size, quantity))
-        category_order = ["pizza", "snack", "cake", "drink"]
-        return tuple(
-            sorted(
-                cart_items,
-                key=lambda x: (category_order.index(x[0].category), x[0].name),
-            )
-        )
 
-    async def get_current_price_amount(self):
-        current_amount = await self.redis.get(self.amount_key)
-        return float(current_amount) if current_amount else 0.0
+    async def get_cart_items(self) -> tuple[CartItem, ...]:
+        return parse_cart(await self.store.get(self.cart_key))
 
-    async def add_price_amount(self, price: float):
-        await self.redis.incrbyfloat(self.amount_key, price)
-        await self.redis.expire(self.amount_key, 3600 * 12)
-        await self.redis.expire(self.cart_key, 3600 * 12)
-
-    async def sub_price_amount(self, price: float):
-        await self.redis.incrbyfloat(self.amount_key, -price)
-        await self.redis.expire(self.amount_key, 3600 * 12)
-        await self.redis.expire(self.cart_key, 3600 * 12)
+    async def get_current_price_amount(self) -> float:
+        return cart_total(await self.get_cart_items())
 
     async def clear(self):
-        await self.redis.delete(self.cart_key)
-        await self.redis.delete(self.amount_key)
+        await self.store.clear(self.cart_key)
+
+    async def change_quantity(
+        self, product: Product, size: str, delta: int | str
+    ) -> tuple[int, tuple[CartItem, ...]]:
+        """delta - изменение количества или "delete" для удаления позиции."""
+        item = CartItem.from_product(product, size, 0, self.db.catalog.version)
+        quantity, lines = await self.store.change_quantity(
+            self.cart_key, item.key, delta, item.snapshot(), settings.CART_TTL
+        )
+        return quantity, parse_cart(lines)
 
-    async def delete_product(self, product_id: str, size: str):
-        await self.redis.hdel(self.cart_key, f"product:{product_id}:{size}")
+    async def increase(self, product: Product, size: str):
+        return await self.change_quantity(product, size, 1)
 
-    async def increase_prod_count(self, product_id: str, size: str):
-        await self.redis.hincrby(self.cart_key, f"product:{product_id}:{size}", 1)
+    async def decrease(self, product: Product, size: str):
+        return await self.change_quantity(product, size, -1)
 
-    async def decrease_prod_count(self, product_id: str, size: str):
-        await self.redis.hincrby(self.cart_key, f"product:{product_id}:{size}", -1)
+    async def delete(self, product: Product, size: str):
+        return await self.change_quantity(product, size, "delete")
+
+    async def revalidate(
+        self, items: tuple[CartItem, ...]
+    ) -> tuple[tuple[CartItem, ...], bool]:
+        """
+        Сверяет снимки с каталогом перед созданием заказа. Если каталог менялся
+        после добавления позиции, берёт актуальные название и цену, удалённые
+        продукты убирает. Возвращает позиции и флаг "цены или состав изменились".
+        """
+        catalog = await self.db.get_catalog()
+        version = str(catalog.version)
+        if all(item.catalog_version == version for item in items):
+            return items, False
+
+        actual = []
+        for item in items:
+            product = catalog.get(item.product_id)
+            if product is None or product.get_size_price(item.size) is None:
+                continue
+            actual.append(
+                CartItem.from_product(product, item.size, item.quantity, version)
+            )
+        changed = [(i.key, i.quantity, i.price) for i in items] != [
+            (i.key, i.quantity, i.price) for i in actual
+        ]
+        return sort_cart(actual), changed
 
 
 async def getall(
     callback: CallbackQuery,
     callback_data: ProductCallback,
-    redis: Redis,
+    cart_store: CartStore,
     db: AsyncSQLiteDatabase,
 ):
     user_id = callback.from_user.id
-    cart = Cart(user_id, redis, db)
-    product = await db.get_product_by_id(callback_data.product_id)
+    cart = Cart(user_id, cart_store, db)
+    # продукт и его категория из одного снимка каталога, версия - ключ кэша клавиатур
+    catalog = await db.get_catalog()
+    product = catalog.get(callback_data.product_id)
     size = callback_data.size
-    product_key = f"product:{product.id}:{size}"
-
-    products = await db.get_products_by_category(product.category)
+    products = catalog.by_category(product.category)
 
     return (
         cart,
         product,
         size,
         products,
-        product_key,
+        catalog.version,
     )
@@ -0,0 +1,158 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from weakref import WeakKeyDictionary
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from src.app.config.settings import settings
+
+# Позиция корзины хранится в hash cart:{user_id} как product:{id}:{size} -> JSON
+# со снимком всего, что нужно для показа корзины (см. CartItem.snapshot):
+# {"q": количество, "p": цена в копейках, "n": название, "e": эмодзи,
+#  "c": категория, "s": текст размера, "v": версия каталога}
+# KEYS[1] - корзина, ARGV[1] - поле товара,
+# ARGV[2] - изменение количества или "delete", ARGV[3] - снимок позиции без "q",
+# ARGV[4] - TTL корзины в секундах.
+# Возвращает {новое количество, содержимое корзины}
+CHANGE_QUANTITY_LUA = """
+local quantity = 0
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+if raw then
+    local ok, line = pcall(cjson.decode, raw)
+    if ok and type(line) == 'table' then
+        quantity = tonumber(line.q) or 0
+    end
+end
+local new_quantity = 0
+if ARGV[2] ~= 'delete' then
+    new_quantity = math.max(quantity + tonumber(ARGV[2]), 0)
+end
+if new_quantity > 0 then
+    local line = cjson.decode(ARGV[3])
+    line.q = new_quantity
+    redis.call('HSET', KEYS[1], ARGV[1], cjson.encode(line))
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+else
+    redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return {new_quantity, redis.call('HGETALL', KEYS[1])}
+"""
+
+
+class CartStore(ABC):
+    """
+    Хранилище корзин: cart_key -> {поле позиции: JSON позиции}.
+
+    TTL у всех реализаций одинаковый: отсчитывается заново при каждом
+    изменении количества, чтение его не продлевает, корзина без позиций удаляется.
+    """
+
+    @abstractmethod
+    async def get(self, cart_key: str) -> dict[str, str]: ...
+
+    @abstractmethod
+    async def change_quantity(
+        self, cart_key: str, field: str, delta: int | str, snapshot: str, ttl: int
+    ) -> tuple[int, dict[str, str]]:
+        """
+        Атомарно меняет количество позиции (delta или "delete") и записывает
+        её снимок. Возвращает новое количество и содержимое корзины.
+        """
+
+    @abstractmethod
+    async def clear(self, cart_key: str) -> None: ...
+
+
+class RedisCartStore(CartStore):
+    """Корзины в Redis, изменение позиции - один вызов Lua-скрипта."""
+
+    _scripts: "WeakKeyDictionary[Redis, AsyncScript]" = WeakKeyDictionary()
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @property
+    def change_quantity_script(self) -> AsyncScript:
+        # регистрируется один раз на клиент Redis, дальше вызывается по EVALSHA
+        script = self._scripts.get(self.redis)
+        if script is None:
+            script = self.redis.register_script(CHANGE_QUANTITY_LUA)
+            self._scripts[self.redis] = script
+        return script
+
+    async def get(self, cart_key: str) -> dict[str, str]:
+        return await self.redis.hgetall(cart_key)
+
+    async def change_quantity(
+        self, cart_key: str, field: str, delta: int | str, snapshot: str, ttl: int
+    ) -> tuple[int, dict[str, str]]:
+        quantity, flat_items = await self.change_quantity_script(
+            keys=[cart_key], args=[field, delta, snapshot, ttl]
+        )
+        return int(quantity), dict(zip(flat_items[::2], flat_items[1::2]))
+
+    async def clear(self, cart_key: str) -> None:
+        await self.redis.delete(cart_key)
+
+
+class MemoryCartStore(CartStore):
+    """
+    Корзины в памяти процесса - для одного воркера без Redis, тестов и бенчмарков.
+    Логика изменения позиции повторяет CHANGE_QUANTITY_LUA.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        # TTL у всех корзин одинаковый, поэтому порядок вставки совпадает
+        # с порядком истечения и просроченные корзины всегда в начале
+        self._carts: dict[str, tuple[float, dict[str, str]]] = {}
+
+    def _evict_expired(self) -> None:
+        now = self.clock()
+        while self._carts:
+            cart_key, (expires_at, _) = next(iter(self._carts.items()))
+            if expires_at > now:
+                return
+            del self._carts[cart_key]
+
+    async def get(self, cart_key: str) -> dict[str, str]:
+        self._evict_expired()
+        item = self._carts.get(cart_key)
+        return dict(item[1]) if item else {}
+
+    async def change_quantity(
+        self, cart_key: str, field: str, delta: int | str, snapshot: str, ttl: int
+    ) -> tuple[int, dict[str, str]]:
+        self._evict_expired()
+        item = self._carts.get(cart_key)
+        lines = item[1] if item else {}
+        try:
+            quantity = int(json.loads(lines[field])["q"])
+        except (KeyError, ValueError, TypeError):
+            quantity = 0
+
+        new_quantity = 0 if delta == "delete" else max(quantity + int(delta), 0)
+        if new_quantity > 0:
+            line = json.loads(snapshot)
+            line["q"] = new_quantity
+            lines[field] = json.dumps(line, ensure_ascii=False)
+            # продление TTL переносит корзину в конец очереди на истечение
+            self._carts.pop(cart_key, None)
+            self._carts[cart_key] = (self.clock() + ttl, lines)
+        else:
+            lines.pop(field, None)
+            if not lines:
+                self._carts.pop(cart_key, None)
+        return new_quantity, dict(lines)
+
+    async def clear(self, cart_key: str) -> None:
+        self._carts.pop(cart_key, None)
+
+
+def init_cart_store(redis: Redis) -> CartStore:
+    if settings.CART_STORE == "memory":
+        return MemoryCartStore()
+    return RedisCartStore(redis)
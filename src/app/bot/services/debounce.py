@@ -0,0 +1,53 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+from src.app.config.logger import logger
+
+Action = Callable[[], Awaitable[None]]
+
+
+class Debouncer:
+    """
+    Склеивает повторные действия по ключу.
+
+    Первый вызов schedule откладывает действие на delay секунд, следующие в
+    этом окне только подменяют его более свежим - выполняется одно, последнее.
+    Вызовы во время выполнения попадают в следующее окно, поэтому действия
+    с одним ключом не идут параллельно.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._pending: dict[Hashable, Action] = {}
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    def schedule(self, key: Hashable, action: Action) -> None:
+        self._pending[key] = action
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(self._run(key))
+
+    def cancel(self, key: Hashable) -> None:
+        """
+        Отменяет действие, которое ещё ждёт окна. Начатое не прерывается:
+        отправленную правку Telegram всё равно применит.
+        """
+        self._pending.pop(key, None)
+
+    async def close(self) -> None:
+        """Дожидается отложенных действий (остановка бота)."""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _run(self, key: Hashable) -> None:
+        try:
+            while key in self._pending:
+                await asyncio.sleep(self.delay)
+                action = self._pending.pop(key, None)
+                if action is None:
+                    # отменено, пока ждало окна
+                    return
+                try:
+                    await action()
+                except Exception as e:
+                    logger.error(f"Ошибка отложенного действия {key}: {e}")
+        finally:
+            del self._tasks[key]
@@ -0,0 +1,64 @@
+import hashlib
+
+from aiogram.types import User as TgUser
+from redis.asyncio import Redis
+
+from src.app.config.settings import settings
+from src.app.database.models import User
+from src.app.database.sqlite_db import AsyncSQLiteDatabase
+
+
+def profile_key(user_id: int) -> str:
+    return f"user_profile:{user_id}"
+
+
+def profile_fingerprint(tg_user: TgUser) -> str:
+    profile = "\x00".join(
+        str(value)
+        for value in (tg_user.username, tg_user.first_name, tg_user.last_name)
+    )
+    return hashlib.sha1(profile.encode()).hexdigest()
+
+
+async def register_user(tg_user: TgUser, redis: Redis, db: AsyncSQLiteDatabase) -> User:
+    """
+    Регистрирует пользователя при /start и "Главном меню".
+
+    Отпечаток последнего записанного профиля хранится в Redis: если профиль
+    в Telegram не изменился, в БД ничего не пишется и не читается.
+    """
+    key = profile_key(tg_user.id)
+    fingerprint = profile_fingerprint(tg_user)
+    cached = await redis.hgetall(key)
+    if cached.get("fingerprint") == fingerprint:
+        return User(
+            id=tg_user.id,
+            username=tg_user.username,
+            first_name=tg_user.first_name,
+            last_name=tg_user.last_name,
+            is_admin=cached.get("is_admin") == "1",
+        )
+
+    db_user = await db.upsert_user(tg_user)
+    if db_user is None:
+        # запись не удалась - показываем меню по данным из Telegram
+        return User(
+            id=tg_user.id,
+            username=tg_user.username,
+            first_name=tg_user.first_name,
+            last_name=tg_user.last_name,
+            is_admin=(tg_user.id == settings.ADMIN_ID),
+        )
+
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hset(
+            key, mapping={"fingerprint": fingerprint, "is_admin": int(db_user.is_admin)}
+        )
+        pipe.expire(key, settings.USER_PROFILE_TTL)
+        await pipe.execute()
+    return db_user
+
+
+async def forget_user(redis: Redis, user_id: int) -> None:
+    """Сбрасывает отпечаток профиля, например после смены прав администратора."""
+    await redis.delete(profile_key(user_id))
@@ -0,0 +1,81 @@
+import multiprocessing
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+from dotenv import load_dotenv
+
+from src.app.bot.dispatcher import create_bot, create_dispatcher
+from src.app.bot.metrics import start_metrics_server
+from src.app.config.logger import logger, setup_logging
+from src.app.config.settings import settings
+
+
+def build_webhook_app(dp: Dispatcher, bot: Bot) -> web.Application:
+    app = web.Application()
+    # апдейт подтверждается Telegram сразу, обработка идёт в фоне
+    SimpleRequestHandler(
+        dispatcher=dp, bot=bot, secret_token=settings.WEBHOOK_SECRET
+    ).register(app, path=settings.WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def set_webhook(bot: Bot, dispatcher: Dispatcher):
+    url = f"{settings.WEBHOOK_URL.rstrip('/')}{settings.WEBHOOK_PATH}"
+    await bot.set_webhook(
+        url,
+        secret_token=settings.WEBHOOK_SECRET,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+        max_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+    )
+    logger.info(f"Webhook установлен: {url}")
+
+
+async def create_app(register_webhook: bool) -> web.Application:
+    dp = await create_dispatcher()
+    bot = create_bot(dp["redis"])
+    if register_webhook:
+        dp.startup.register(set_webhook)
+    return build_webhook_app(dp, bot)
+
+
+def run_worker(index: int):
+    load_dotenv()
+    setup_logging()
+    logger.info(f"Воркер webhook #{index} запущен")
+    start_metrics_server(index)
+    # webhook в Telegram регистрирует только первый воркер
+    web.run_app(
+        create_app(register_webhook=index == 0),
+        host=settings.WEBHOOK_HOST,
+        port=settings.WEBHOOK_PORT,
+        reuse_port=settings.WEBHOOK_WORKERS > 1,
+        print=None,
+    )
+
+
+def run_webhook():
+    """
+    Бот в режиме webhook. При WEBHOOK_WORKERS > 1 запускается несколько
+    процессов на одном порту (SO_REUSEPORT), ядро распределяет соединения между ними.
+    """
+    if not settings.WEBHOOK_URL:
+        raise RuntimeError("Для режима webhook нужен WEBHOOK_URL")
+    if settings.WEBHOOK_WORKERS > 1 and settings.CART_STORE == "memory":
+        logger.warning("CART_STORE=memory: у каждого воркера будут свои корзины")
+
+    if settings.WEBHOOK_WORKERS == 1:
+        run_worker(0)
+        return
+
+    # spawn: каждый воркер заново создаёт event loop, соединения и роутеры
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=run_worker, args=(index,))
+        for index in range(settings.WEBHOOK_WORKERS)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
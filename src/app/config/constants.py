@@ -13,20 +13,35 @@ class CategoriesAvailable(str, Enum):
     CAKE = "cake"
 
 
+# порядок категорий при выводе каталога, корзины и заказов
+CATEGORY_ORDER = ("pizza", "snack", "cake", "drink")
+
+
 class MenuCommands(str, Enum):
     MAIN_MENU = "main_menu"
     CATALOG = "catalog"
     CONTACTS = "contacts"
+    # пункты меню, ведущие в разделы корзины, заказов и админки
+    CART = "cart"
+    ORDERS = "orders"
+    ADMIN = "admin"
 
 
 class OrderCommands(str, Enum):
     ORDERS = "orders"
+    ORDERS_PAGE = "orders_page"
     ORDER_DETAILS = "order_details"
     CANCEL = "cancel"
     CONFIRM = "confirm"
     EDIT_STREET = "edit_street"
 
 
+class OrderStatus(str, Enum):
+    PENDING = "pending"
+    DONE = "done"
+    CANCELLED = "cancelled"
+
+
 class CategoryCommands(str, Enum):
     PIZZA = "pizza"
     SNACK = "snack"
@@ -45,6 +60,7 @@ class CartCommands(str, Enum):
 
 class ProductCommands(str, Enum):
     VIEW_PRODUCT_DETAILS = "view_product_details"
+    ADD_TO_CART = "add_to_cart"
 
 
 class AdminCommands(str, Enum):
@@ -62,6 +78,10 @@ class AdminCommands(str, Enum):
     GET_ADMIN_INFO = "get_admin_info"
     CREATE_ADMIN = "create_admin"
     DISMISS_ADMIN = "dismiss_admin"
+    SALES_REPORT = "sales_report"
+    BROADCAST = "broadcast"
+    BROADCAST_CONFIRM = "broadcast_confirm"
+    BROADCAST_CANCEL = "broadcast_cancel"
 
 
 class EditingField(str, Enum):
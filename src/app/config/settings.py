@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -18,6 +19,75 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "localhost"
     DATABASE_URL: str = "sqlite+aiosqlite:///src/app/database/shop.db"
 
+    # PRAGMA, применяемые к каждому соединению SQLite
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # байты
+    SQLITE_CACHE_SIZE: int = -64000  # отрицательное значение - размер в КиБ
+    SQLITE_BUSY_TIMEOUT: int = 5000  # мс
+    # 0 - отдельный пул для чтения не создаётся, всё идёт через основной движок
+    SQLITE_READ_POOL_SIZE: int = 4
+    # group commit: записи за окно фиксируются одной транзакцией
+    SQLITE_GROUP_COMMIT: bool = False
+    SQLITE_GROUP_COMMIT_WINDOW_MS: int = 5
+    SQLITE_GROUP_COMMIT_MAX_BATCH: int = 100
+
+    # пул соединений PostgreSQL (DATABASE_URL=postgresql+asyncpg://...)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    # 0 - отключить кэш подготовленных запросов asyncpg (нужно за pgbouncer)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # 0 - кэш каталога сбрасывается только при изменениях в этом же процессе
+    CATALOG_CACHE_TTL: int = 60  # секунды
+
+    # polling - один цикл long-poll, webhook - aiohttp-сервер с несколькими воркерами
+    BOT_MODE: Literal["polling", "webhook"] = "polling"
+    WEBHOOK_URL: str | None = None  # публичный адрес, например https://bot.example.com
+    WEBHOOK_PATH: str = "/webhook"
+    # проверяется в заголовке X-Telegram-Bot-Api-Secret-Token
+    WEBHOOK_SECRET: str | None = None
+    WEBHOOK_HOST: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_WORKERS: int = 1
+    WEBHOOK_MAX_CONNECTIONS: int = 40  # одновременных запросов от Telegram (1-100)
+
+    # ограничение исходящих запросов к Bot API; общий лимит - на весь бот,
+    # каждый воркер webhook получает свою долю (RATE_LIMIT_GLOBAL / WEBHOOK_WORKERS)
+    RATE_LIMIT_GLOBAL: float = 30  # сообщений в секунду на бота
+    RATE_LIMIT_GLOBAL_BURST: int = 30
+    # лимит чата - в каждом процессе свой
+    RATE_LIMIT_CHAT: float = 1  # сообщений в секунду в один чат
+    RATE_LIMIT_CHAT_BURST: int = 3
+    RATE_LIMIT_MAX_RETRIES: int = 3  # повторов после TelegramRetryAfter
+    RATE_LIMIT_RETRY_JITTER: float = 1.0  # секунды
+    # сколько помнить отпечаток последней правки сообщения (пропуск одинаковых правок)
+    EDIT_FINGERPRINT_TTL: int = 3600  # секунды
+
+    # /metrics бота для Prometheus, 0 - выключено
+    METRICS_HOST: str = "0.0.0.0"
+    METRICS_PORT: int = 9100
+
+    # рассылка: ниже RATE_LIMIT_GLOBAL, чтобы оставался запас для ответов пользователям,
+    # как и общий лимит делится между воркерами
+    BROADCAST_RATE: float = 25  # сообщений в секунду на бота
+    BROADCAST_CHUNK_SIZE: int = 100  # пользователей на пачку и шаг сохранения прогресса
+
+    # FSM (оформление заказа, админка) в Redis, общий для всех воркеров бота
+    FSM_KEY_PREFIX: str = "fsm"
+    FSM_STATE_TTL: int = 3600 * 24  # секунды, 0 - без ограничения
+    FSM_DATA_TTL: int = 3600 * 24  # секунды, 0 - без ограничения
+
+    USER_PROFILE_TTL: int = 3600 * 24  # секунды
+    CART_TTL: int = 3600 * 12  # секунды
+    CART_RENDER_DELAY_MS: int = 250  # окно склейки перерисовок корзины при нажатиях +/-
+    # "memory" - корзины в памяти процесса, только для одного воркера бота
+    CART_STORE: Literal["redis", "memory"] = "redis"
+    ORDERS_PAGE_SIZE: int = 10
+    ORDERS_FIRST_PAGE_TTL: int = 30  # секунды
+
+    # токен для выгрузок админ-API (заголовок X-API-Key), без него выгрузки выключены
+    EXPORT_API_TOKEN: str | None = None
+
     MAPS_API_KEY: str
     TEST_PAYMENT_KEY: str
 
@@ -25,5 +95,10 @@ class Settings(BaseSettings):
     def REDIS_URL(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/0"
 
+    @property
+    def BOT_WORKERS(self) -> int:
+        """Число процессов бота, которые делят общие лимиты Bot API."""
+        return self.WEBHOOK_WORKERS if self.BOT_MODE == "webhook" else 1
+
 
 settings = Settings()
@@ -0,0 +1,65 @@
+import asyncio
+import time
+from operator import attrgetter
+
+from .models import Product
+
+
+class CatalogCache:
+    """
+    Кэш каталога в памяти процесса: все продукты по id и по категориям.
+
+    version увеличивается при каждом изменении каталога (add/edit/delete_product),
+    кэш перечитывается из БД при первом чтении после изменения. Если задан ttl,
+    кэш перечитывается и по истечении ttl секунд - так до процесса доходят
+    изменения, сделанные другими воркерами или API.
+    """
+
+    def __init__(self, ttl: float | None = None):
+        self.ttl = ttl
+        # стартуем со времени, чтобы версии разных запусков не совпадали
+        self.version = time.time_ns()
+        self.lock = asyncio.Lock()
+        self._loaded_version: int | None = None
+        self._loaded_at = 0.0
+        self._products: list[Product] = []
+        self._by_id: dict[int, Product] = {}
+        self._by_category: dict[str, list[Product]] = {}
+
+    @property
+    def is_actual(self) -> bool:
+        if self._loaded_version != self.version:
+            return False
+        if self.ttl and time.monotonic() - self._loaded_at > self.ttl:
+            self.invalidate()
+            return False
+        return True
+
+    def invalidate(self) -> None:
+        self.version += 1
+
+    def load(self, products: list[Product], version: int) -> None:
+        # products уже отсортированы запросом по категории и названию,
+        # внутри страницы категории продукты идут в порядке добавления
+        self._products = list(products)
+        self._by_id = {product.id: product for product in products}
+        by_category: dict[str, list[Product]] = {}
+        for product in sorted(products, key=attrgetter("id")):
+            by_category.setdefault(product.category, []).append(product)
+        self._by_category = by_category
+        self._loaded_version = version
+        self._loaded_at = time.monotonic()
+
+    def all(self) -> list[Product]:
+        return list(self._products)
+
+    def get(self, product_id) -> Product | None:
+        return self._by_id.get(int(product_id))
+
+    def by_category(self, category: str) -> list[Product]:
+        # закуски и тортики показываются на одной странице, закуски первыми
+        if category in ["cake", "snack"]:
+            return self._by_category.get("snack", []) + self._by_category.get(
+                "cake", []
+            )
+        return list(self._by_category.get(category, []))
@@ -1,16 +1,35 @@
-from datetime import datetime, timedelta
-
-from sqlalchemy import DateTime, ForeignKey, String, func, text
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    false,
+    func,
+    text,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
+# даты в БД хранятся в UTC, пользователям и в отчётах - местное время (Минск)
+LOCAL_TIME_OFFSET = timedelta(hours=3)
+
+
+def to_local_time(moment: datetime) -> datetime:
+    return moment + LOCAL_TIME_OFFSET
+
+
 class Base(DeclarativeBase):
     pass
 
 
 class User(Base):
     __tablename__ = "users"
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    # id из Telegram не помещаются в 32 бита, в PostgreSQL нужен BIGINT
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
     username: Mapped[str] = mapped_column(String(100), nullable=False)
     first_name: Mapped[str] = mapped_column(String(100), nullable=False)
     last_name: Mapped[str] = mapped_column(String(100), nullable=True)
@@ -20,12 +39,16 @@ class User(Base):
         nullable=False,
     )
     is_admin: Mapped[bool] = mapped_column(
-        default=False, server_default=text("0"), nullable=False
+        default=False, server_default=false(), nullable=False
+    )
+    # пользователь заблокировал бота - рассылки его пропускают
+    is_blocked: Mapped[bool] = mapped_column(
+        default=False, server_default=false(), nullable=False
     )
 
     @property
     def created_at_local(self):
-        return self.created_at + timedelta(hours=3)
+        return to_local_time(self.created_at)
 
 
 class Product(Base):
@@ -37,7 +60,7 @@ class Product(Base):
     nutrition: Mapped[str | None] = mapped_column(String(40), nullable=True)
     price_small: Mapped[float] = mapped_column(nullable=False)
     price_large: Mapped[float] = mapped_column(nullable=True)
-    category: Mapped[str] = mapped_column(String(50), nullable=True)
+    category: Mapped[str] = mapped_column(String(50), nullable=True, index=True)
     category_rus: Mapped[str] = mapped_column(String(50), nullable=True)
     emoji: Mapped[str] = mapped_column(String(5), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
@@ -89,8 +112,14 @@ class Product(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # история заказов пользователя: фильтр по user_id и сортировка по дате
+        Index("ix_orders_user_id_created_at", "user_id", "created_at", "id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("users.id"), nullable=False
+    )
     client_name: Mapped[str] = mapped_column(String(50), nullable=False)
     phone: Mapped[str] = mapped_column(String(9), nullable=False)
     address: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -110,16 +139,40 @@ class Order(Base):
 
     @property
     def created_at_local(self):
-        return self.created_at + timedelta(hours=3)
+        return to_local_time(self.created_at)
 
 
 class OrderItem(Base):
     __tablename__ = "order_items"
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     order_id: Mapped[int] = mapped_column(
-        ForeignKey("orders.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("orders.id", ondelete="CASCADE"), nullable=False, index=True
     )
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False)
     quantity: Mapped[int] = mapped_column(nullable=False)
     price: Mapped[float] = mapped_column(nullable=False)
     size: Mapped[str] = mapped_column(String(10), nullable=False)
+
+    @property
+    def price_kopecks(self) -> int:
+        # price хранится в рублях с плавающей точкой: 19.9 * 100 = 1989.99...
+        return round(self.price * 100)
+
+
+# агрегаты продаж, обновляются при смене статуса заказа (set_order_status)
+class DailySales(Base):
+    __tablename__ = "daily_sales"
+    day: Mapped[date] = mapped_column(Date, primary_key=True)  # по местному времени
+    orders_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    cancelled_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(nullable=False, default=0)
+
+
+class ProductSales(Base):
+    __tablename__ = "product_sales"
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    quantity: Mapped[int] = mapped_column(nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(nullable=False, default=0, index=True)
+    product: Mapped["Product"] = relationship()
@@ -1,3 +1,4 @@
+from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
 from redis.asyncio import Redis
 
 from src.app.config.logger import logger
@@ -17,3 +18,16 @@ async def init_redis() -> Redis | None:
     except Exception as e:
         logger.error(f"Ошибка при соединении с Redis: {e}")
         raise
+
+
+def init_fsm_storage(redis: Redis) -> RedisStorage:
+    """
+    Хранилище FSM на том же соединении Redis: состояние оформления заказа
+    переживает перезапуск и доступно любому воркеру бота.
+    """
+    return RedisStorage(
+        redis,
+        key_builder=DefaultKeyBuilder(prefix=settings.FSM_KEY_PREFIX, with_bot_id=True),
+        state_ttl=settings.FSM_STATE_TTL or None,
+        data_ttl=settings.FSM_DATA_TTL or None,
+    )
@@ -1,20 +1,150 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
 from typing import Self
 
-from sqlalchemy import select, text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-
+from sqlalchemy import (
+    Row,
+    case,
+    event,
+    false,
+    func,
+    make_url,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import joinedload
+
+from src.app.config.constants import CATEGORY_ORDER, OrderStatus
 from src.app.config.logger import logger
 from src.app.config.settings import settings
 
-from .models import Order, OrderItem, Product, User
+from .catalog_cache import CatalogCache
+from .models import (
+    DailySales,
+    Order,
+    OrderItem,
+    Product,
+    ProductSales,
+    User,
+    to_local_time,
+)
+from .ttl_cache import TTLCache
+from .write_queue import WriteOperation, WriteQueue
+
+
+def category_rank():
+    return case(
+        {category: rank for rank, category in enumerate(CATEGORY_ORDER)},
+        value=Product.category,
+        else_=len(CATEGORY_ORDER),
+    )
+
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+    }
+
+
+def unicode_lower(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+def configure_sqlite_engine(
+    engine: AsyncEngine, pragmas: dict[str, str | int], read_only: bool = False
+) -> AsyncEngine:
+    if read_only:
+        pragmas = {**pragmas, "query_only": "ON"}
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, value in pragmas.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        cursor.close()
+        # встроенный lower() SQLite меняет регистр только у ASCII, а названия кириллицей
+        dbapi_connection.create_function("lower", 1, unicode_lower, deterministic=True)
+
+    return engine
+
+
+def create_postgres_engine(db_url: str) -> AsyncEngine:
+    return create_async_engine(
+        db_url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        connect_args={"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
 
 
 class AsyncSQLiteDatabase:
-    def __init__(self, db_path: str = settings.DATABASE_URL):
-        self.engine = create_async_engine(db_path)
+    """
+    Слой доступа к БД. По умолчанию работает с файлом SQLite, при DATABASE_URL
+    вида postgresql+asyncpg://... - с PostgreSQL (несколько воркеров и реплик API).
+    """
+
+    def __init__(
+        self,
+        db_path: str = settings.DATABASE_URL,
+        read_pool_size: int = settings.SQLITE_READ_POOL_SIZE,
+        pragmas: dict[str, str | int] | None = None,
+    ):
+        db_url = make_url(db_path)
+        self.backend = db_url.get_backend_name()
+        if self.backend == "postgresql":
+            self.engine = create_postgres_engine(db_path)
+        else:
+            pragmas = sqlite_pragmas() if pragmas is None else pragmas
+            self.engine = configure_sqlite_engine(create_async_engine(db_path), pragmas)
         self.AsyncSession = async_sessionmaker(
             self.engine, expire_on_commit=False, class_=AsyncSession
         )
+        # отдельный пул только для чтения: в режиме WAL читатели не блокируются
+        # писателем и не ждут друг друга на одном соединении
+        self.read_engine = None
+        if (
+            self.backend == "sqlite"
+            and read_pool_size
+            and db_url.database not in (None, "", ":memory:")
+        ):
+            self.read_engine = configure_sqlite_engine(
+                create_async_engine(db_path, pool_size=read_pool_size, max_overflow=0),
+                pragmas,
+                read_only=True,
+            )
+        self.ReadSession = async_sessionmaker(
+            self.read_engine or self.engine,
+            expire_on_commit=False,
+            class_=AsyncSession,
+        )
+        # при нескольких процессах изменения каталога в другом процессе
+        # подхватываются не позже чем через CATALOG_CACHE_TTL
+        self.catalog = CatalogCache(ttl=settings.CATALOG_CACHE_TTL)
+        # первая страница "Мои заказы" - самый частый запрос истории заказов
+        self.orders_first_page = TTLCache(settings.ORDERS_FIRST_PAGE_TTL)
+        self.write_queue = None
+        if self.backend == "sqlite" and settings.SQLITE_GROUP_COMMIT:
+            self.write_queue = WriteQueue(
+                self.AsyncSession,
+                window_ms=settings.SQLITE_GROUP_COMMIT_WINDOW_MS,
+                max_batch=settings.SQLITE_GROUP_COMMIT_MAX_BATCH,
+            )
 
     async def init_db(self) -> Self | None:
         result = await self.check_connection()
@@ -23,51 +153,90 @@ class AsyncSQLiteDatabase:
         else:
             return None
 
+    def insert(self, table):
+        """INSERT с поддержкой ON CONFLICT для текущей БД."""
+        insert = pg_insert if self.backend == "postgresql" else sqlite_insert
+        return insert(table)
+
+    async def write(self, operation: WriteOperation):
+        """
+        Выполняет операцию записи: через очередь group commit, если она включена,
+        иначе в собственной транзакции.
+        """
+        if self.write_queue:
+            return await self.write_queue.submit(operation)
+        async with self.AsyncSession() as session:
+            result = await operation(session)
+            await session.commit()
+            return result
+
     async def add_user(
         self, user_id: int, username: str, first_name: str, last_name: str | None
     ) -> User | None:
-        async with self.AsyncSession() as session:
-            try:
-                new_user = User(
-                    id=user_id,
-                    username=username,
-                    first_name=first_name,
-                    last_name=last_name,
-                    is_admin=(user_id == settings.ADMIN_ID),
-                )
+        new_user = User(
+            id=user_id,
+            username=username,
+            first_name=first_name,
+            last_name=last_name,
+            is_admin=(user_id == settings.ADMIN_ID),
+        )
 
-                session.add(new_user)
-                await session.commit()
+        async def operation(session: AsyncSession) -> None:
+            session.add(new_user)
 
-            except Exception as e:
-                await session.rollback()
-                logger.error(f" Ошибка при добавлении пользователя: {e}")
+        try:
+            await self.write(operation)
+        except Exception as e:
+            logger.error(f" Ошибка при добавлении пользователя: {e}")
         return new_user
 
     from aiogram.types import User as TgUser
 
-    async def update_user(self, tg_user: TgUser) -> User | None:
-        async with self.AsyncSession() as session:
-            db_user: User = await session.get(User, tg_user.id)
-            try:
-                if (
-                    db_user.username != tg_user.username
-                    or db_user.first_name != tg_user.first_name
-                    or db_user.last_name != tg_user.last_name
-                ):
-                    db_user.username = tg_user.username
-                    db_user.first_name = tg_user.first_name
-                    db_user.last_name = tg_user.last_name
-
-                if tg_user.id == settings.ADMIN_ID:
-                    db_user.is_admin = True
-
-                session.add(db_user)
-                await session.commit()
-                return db_user
-            except Exception as e:
-                await session.rollback()
-                logger.error(f" Ошибка при обновлении пользователя: {e}")
+    async def upsert_user(self, tg_user: TgUser) -> User | None:
+        """
+        Регистрирует пользователя или обновляет его профиль одним запросом
+        INSERT ... ON CONFLICT DO UPDATE. Строка перезаписывается, только если
+        данные профиля изменились (или суперадмин ещё не отмечен админом).
+        """
+        stmt = self.insert(User).values(
+            id=tg_user.id,
+            username=tg_user.username,
+            first_name=tg_user.first_name,
+            last_name=tg_user.last_name,
+            is_admin=(tg_user.id == settings.ADMIN_ID),
+        )
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.id],
+            set_={
+                "username": excluded.username,
+                "first_name": excluded.first_name,
+                "last_name": excluded.last_name,
+                "is_admin": User.is_admin | excluded.is_admin,
+                # вернулся после блокировки бота - снова получает рассылки
+                "is_blocked": false(),
+            },
+            where=or_(
+                User.username.is_distinct_from(excluded.username),
+                User.first_name.is_distinct_from(excluded.first_name),
+                User.last_name.is_distinct_from(excluded.last_name),
+                excluded.is_admin & ~User.is_admin,
+                User.is_blocked,
+            ),
+        ).returning(User)
+
+        async def operation(session: AsyncSession) -> User | None:
+            result = await session.execute(
+                stmt, execution_options={"populate_existing": True}
+            )
+            db_user = result.scalar_one_or_none()
+            # профиль не изменился - строка не записывалась и не вернулась
+            return db_user or await session.get(User, tg_user.id)
+
+        try:
+            return await self.write(operation)
+        except Exception as e:
+            logger.error(f" Ошибка при обновлении пользователя: {e}")
 
     async def add_product(
         self,
@@ -85,8 +254,8 @@ class AsyncSQLiteDatabase:
             try:
                 product = Product(
                     name=name,
-                    price_small=price_small,
-                    price_large=price_large,
+                    price_small=float(price_small),
+                    price_large=float(price_large) if price_large else None,
                     category=category,
                     category_rus=category_rus,
                     description=description,
@@ -96,6 +265,7 @@ class AsyncSQLiteDatabase:
                 )
                 session.add(product)
                 await session.commit()
+                self.catalog.invalidate()
                 return product
 
             except Exception as e:
@@ -111,42 +281,44 @@ class AsyncSQLiteDatabase:
         address_text,
         additional_info,
     ) -> Order | None:
-        async with self.AsyncSession() as session:
-            try:
-                order = Order(
-                    user_id=user_id,
-                    client_name=client_name,
-                    phone=phone,
-                    address=address_text,
-                    additional_info=additional_info,
+        async def operation(session: AsyncSession) -> Order:
+            order = Order(
+                user_id=user_id,
+                client_name=client_name,
+                phone=phone,
+                address=address_text,
+                additional_info=additional_info,
+            )
+            session.add(order)
+            await session.flush()
+            total_amount = 0  # в копейках
+            for item in list_cart_items:
+                # списываем цену из корзины (CartItem.price, копейки) - ту же,
+                # что пользователь видел в корзине
+                order_item = OrderItem(
+                    order_id=order.id,
+                    product_id=item.product_id,
+                    quantity=item.quantity,
+                    price=item.price / 100,
+                    size=item.size,
                 )
-                total_amount = 0
-                session.add(order)
-                await session.flush()
-                for item in list_cart_items:
-                    product, size, quantity = item
-                    product: Product
-                    order_item = OrderItem(
-                        order_id=order.id,
-                        product_id=product.id,
-                        quantity=quantity,
-                        price=product.get_size_price(size),
-                        size=size,
-                    )
-                    total_amount += order_item.price * order_item.quantity
-                    session.add(order_item)
-                order.amount = total_amount
-                await session.commit()
-                return order
-            except Exception as e:
-                await session.rollback()
-                logger.error(f" Ошибка при добавлении заказа: {e}")
+                total_amount += item.price * item.quantity
+                session.add(order_item)
+            order.amount = total_amount / 100
+            return order
+
+        try:
+            order = await self.write(operation)
+            self.orders_first_page.pop(user_id)
+            return order
+        except Exception as e:
+            logger.error(f" Ошибка при добавлении заказа: {e}")
 
     async def make_admin(self, user_id) -> None:
         async with self.AsyncSession() as session:
             user = await session.get(User, user_id)
             if not user:
-                return None
+                return
             user.is_admin = True
             await session.commit()
 
@@ -154,86 +326,331 @@ class AsyncSQLiteDatabase:
         async with self.AsyncSession() as session:
             user = await session.get(User, user_id)
             if not user:
-                return None
+                return
             user.is_admin = False
             await session.commit()
 
     async def get_users(self) -> list[User]:
-        async with self.AsyncSession() as session:
+        async with self.ReadSession() as session:
             stmt = select(User)
             result = await session.execute(stmt)
             return result.scalars().all()
 
+    async def get_user_ids_chunk(self, after_id: int, limit: int) -> list[int]:
+        """
+        Следующая пачка id незаблокированных пользователей после after_id
+        (keyset по первичному ключу): каждая пачка - короткий запрос, обход
+        можно продолжить с любого места.
+        """
+        async with self.ReadSession() as session:
+            result = await session.execute(
+                select(User.id)
+                .where(User.id > after_id, User.is_blocked.is_(False))
+                .order_by(User.id)
+                .limit(limit)
+            )
+            return list(result.scalars())
+
+    async def count_active_users(self) -> int:
+        async with self.ReadSession() as session:
+            return await session.scalar(
+                select(func.count(User.id)).where(User.is_blocked.is_(False))
+            )
+
+    async def mark_users_blocked(self, user_ids: Sequence[int]) -> None:
+        stmt = update(User).where(User.id.in_(user_ids)).values(is_blocked=True)
+
+        async def operation(session: AsyncSession) -> None:
+            await session.execute(stmt)
+
+        await self.write(operation)
+
+    async def stream_users(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Sequence[User]]:
+        """Все пользователи пачками через серверный курсор, без загрузки в память."""
+        async with self.ReadSession() as session:
+            result = await session.stream_scalars(
+                select(User).order_by(User.id).execution_options(yield_per=batch_size)
+            )
+            async for batch in result.partitions():
+                yield batch
+
+    async def stream_order_rows(
+        self,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Заказы с позициями для выгрузки: одна строка на позицию, строки одного
+        заказа идут подряд. Читается серверным курсором пачками по batch_size.
+        """
+        stmt = (
+            select(
+                Order.id,
+                Order.created_at,
+                Order.user_id,
+                Order.client_name,
+                Order.phone,
+                Order.address,
+                Order.additional_info,
+                Order.amount,
+                Order.status,
+                OrderItem.product_id,
+                Product.name.label("product_name"),
+                OrderItem.size,
+                OrderItem.quantity,
+                OrderItem.price,
+            )
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .outerjoin(Product, Product.id == OrderItem.product_id)
+            .order_by(Order.id, OrderItem.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if date_from:
+            stmt = stmt.where(Order.created_at >= date_from)
+        if date_to:
+            stmt = stmt.where(Order.created_at < date_to)
+        async with self.ReadSession() as session:
+            result = await session.stream(stmt)
+            async for batch in result.partitions():
+                yield batch
+
     async def get_admins(self) -> list[User]:
-        async with self.AsyncSession() as session:
+        async with self.ReadSession() as session:
             stmt = select(User).where(User.is_admin)
             result = await session.execute(stmt)
             return result.scalars().all()
 
     async def get_products(self) -> list[Product]:
-        async with self.AsyncSession() as session:
-            result = await session.execute(select(Product))
-            category_order = ["pizza", "snack", "cake", "drink"]
-            return sorted(
-                result.scalars().all(),
-                key=lambda x: (category_order.index(x.category), x.name.lower()),
+        catalog = await self.get_catalog()
+        return catalog.all()
+
+    async def get_orders_by_user(
+        self,
+        user_id,
+        cursor: int | None = None,
+        limit: int | None = None,
+        backward=False,
+    ) -> list[Order]:
+        """
+        Заказы пользователя от новых к старым, keyset-пагинация по
+        (user_id, created_at, id).
+
+        cursor - id заказа, после которого (более старые) или, при backward,
+        до которого (более новые) берётся страница.
+        """
+        first_page = cursor is None and not backward and limit is not None
+        if first_page:
+            cached = self.orders_first_page.get(user_id)
+            if cached and cached[0] == limit:
+                return cached[1]
+
+        stmt = select(Order).where(Order.user_id == user_id)
+        if cursor is not None:
+            cursor_created_at = (
+                select(Order.created_at).where(Order.id == cursor).scalar_subquery()
+            )
+            order_key = tuple_(Order.created_at, Order.id)
+            cursor_key = tuple_(cursor_created_at, cursor)
+            stmt = stmt.where(
+                order_key > cursor_key if backward else order_key < cursor_key
             )
+        if backward:
+            stmt = stmt.order_by(Order.created_at, Order.id)
+        else:
+            stmt = stmt.order_by(Order.created_at.desc(), Order.id.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
 
-    async def get_orders_by_user(self, user_id) -> list[Order]:
-        async with self.AsyncSession() as session:
-            stmt = select(Order).where(Order.user_id == user_id)
+        async with self.ReadSession() as session:
             result = await session.execute(stmt)
-            return sorted(result.scalars().all(), key=lambda x: x.created_at)
+            orders = result.scalars().all()
+        if backward:
+            orders.reverse()
+        if first_page:
+            self.orders_first_page.set(user_id, (limit, orders))
+        return orders
 
     async def get_order_items(self, order_id) -> list[OrderItem]:
-        async with self.AsyncSession() as session:
+        async with self.ReadSession() as session:
             stmt = select(OrderItem).where(OrderItem.order_id == order_id)
             result = await session.execute(stmt)
             return result.scalars().all()
 
     async def get_order_by_id(self, order_id) -> Order | None:
-        async with self.AsyncSession() as session:
+        async with self.ReadSession() as session:
             result = await session.get(Order, order_id)
             return result
 
+    async def get_order_full(self, order_id) -> Order | None:
+        # заказ, его позиции и продукты позиций одним запросом
+        async with self.ReadSession() as session:
+            stmt = (
+                select(Order)
+                .where(Order.id == order_id)
+                .options(joinedload(Order.order_items).joinedload(OrderItem.product))
+            )
+            result = await session.execute(stmt)
+            return result.unique().scalar_one_or_none()
+
     async def get_product_by_id(self, product_id) -> Product | None:
-        async with self.AsyncSession() as session:
-            product = await session.get(Product, product_id)
-            return product
+        catalog = await self.get_catalog()
+        return catalog.get(product_id)
 
     async def get_user_by_id(self, user_id) -> User | None:
-        async with self.AsyncSession() as session:
+        async with self.ReadSession() as session:
             result = await session.get(User, user_id)
             return result
 
     async def get_products_by_category(self, category: str) -> list[Product]:
-        async with self.AsyncSession() as session:
-            if category in ["cake", "snack"]:
-                stmt = select(Product).where(Product.category.in_(["cake", "snack"]))
-            else:
-                stmt = select(Product).where(Product.category == category)
-            result = await session.execute(stmt)
-            products: list[Product] = result.scalars().all()
-            products.sort(key=lambda x: x.category, reverse=True)
-            return products
+        catalog = await self.get_catalog()
+        return catalog.by_category(category)
+
+    async def get_catalog(self) -> CatalogCache:
+        if not self.catalog.is_actual:
+            async with self.catalog.lock:
+                if not self.catalog.is_actual:
+                    # версия фиксируется до запроса: если каталог изменят во время
+                    # загрузки, следующее чтение перезагрузит его ещё раз
+                    version = self.catalog.version
+                    async with self.ReadSession() as session:
+                        result = await session.execute(
+                            select(Product).order_by(
+                                category_rank(), func.lower(Product.name)
+                            )
+                        )
+                        self.catalog.load(result.scalars().all(), version)
+        return self.catalog
+
+    async def set_order_status(
+        self, order_id, new_status: OrderStatus, old_status: OrderStatus
+    ) -> bool:
+        """
+        Атомарно меняет статус заказа, если текущий статус равен old_status.
+        Один UPDATE без загрузки заказа, в той же транзакции обновляются агрегаты
+        продаж. Возвращает True, если статус изменён.
+        """
+        stmt = (
+            update(Order)
+            .where(Order.id == int(order_id), Order.status == old_status)
+            .values(status=new_status)
+            .returning(Order.user_id, Order.created_at, Order.amount)
+            .execution_options(synchronize_session=False)
+        )
 
-    async def order_set_pending(self, order_id) -> None:
-        async with self.AsyncSession() as session:
-            order = await session.get(Order, order_id)
-            order.status = "pending"
-            await session.commit()
+        async def operation(session: AsyncSession) -> int | None:
+            order = (await session.execute(stmt)).one_or_none()
+            if order is None:
+                return None
+            await self.update_sales(
+                session,
+                int(order_id),
+                order.created_at,
+                order.amount,
+                new_status,
+                old_status,
+            )
+            return order.user_id
 
-    async def order_set_done(self, order_id) -> None:
-        async with self.AsyncSession() as session:
-            order = await session.get(Order, order_id)
-            order.status = "done"
-            await session.commit()
+        user_id = await self.write(operation)
+        if user_id is None:
+            return False
+        self.orders_first_page.pop(user_id)
+        return True
 
-    async def order_set_cancelled(self, order_id) -> None:
-        async with self.AsyncSession() as session:
-            order = await session.get(Order, order_id)
-            order.status = "cancelled"
-            await session.commit()
+    async def update_sales(
+        self,
+        session: AsyncSession,
+        order_id: int,
+        created_at: datetime,
+        amount: float,
+        new_status: OrderStatus,
+        old_status: OrderStatus,
+    ) -> None:
+        """Инкрементально обновляет daily_sales и product_sales при смене статуса."""
+        done = (new_status == OrderStatus.DONE) - (old_status == OrderStatus.DONE)
+        cancelled = (new_status == OrderStatus.CANCELLED) - (
+            old_status == OrderStatus.CANCELLED
+        )
+        if not done and not cancelled:
+            return
+
+        # день по местному времени, как в Order.created_at_local
+        day: date = to_local_time(created_at).date()
+        stmt = self.insert(DailySales).values(
+            day=day,
+            orders_count=done,
+            cancelled_count=cancelled,
+            revenue=done * amount,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailySales.day],
+            set_={
+                "orders_count": DailySales.orders_count + stmt.excluded.orders_count,
+                "cancelled_count": DailySales.cancelled_count
+                + stmt.excluded.cancelled_count,
+                "revenue": DailySales.revenue + stmt.excluded.revenue,
+            },
+        )
+        await session.execute(stmt)
+        if not done:
+            return
+
+        items = (
+            select(
+                OrderItem.product_id,
+                func.sum(OrderItem.quantity) * done,
+                func.sum(OrderItem.price * OrderItem.quantity) * done,
+            )
+            .where(OrderItem.order_id == order_id)
+            .group_by(OrderItem.product_id)
+        )
+        stmt = self.insert(ProductSales).from_select(
+            ["product_id", "quantity", "revenue"], items
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductSales.product_id],
+            set_={
+                "quantity": ProductSales.quantity + stmt.excluded.quantity,
+                "revenue": ProductSales.revenue + stmt.excluded.revenue,
+            },
+        )
+        await session.execute(stmt)
+
+    async def order_set_pending(self, order_id) -> bool:
+        return await self.set_order_status(
+            order_id, OrderStatus.PENDING, old_status=OrderStatus.CANCELLED
+        )
+
+    async def order_set_done(self, order_id) -> bool:
+        return await self.set_order_status(
+            order_id, OrderStatus.DONE, old_status=OrderStatus.PENDING
+        )
+
+    async def order_set_cancelled(self, order_id) -> bool:
+        return await self.set_order_status(
+            order_id, OrderStatus.CANCELLED, old_status=OrderStatus.PENDING
+        )
+
+    async def get_daily_sales(self, days: int = 7) -> list[DailySales]:
+        """Последние days дней с продажами, новые первыми."""
+        async with self.ReadSession() as session:
+            result = await session.execute(
+                select(DailySales).order_by(DailySales.day.desc()).limit(days)
+            )
+            return list(result.scalars().all())
+
+    async def get_top_products(self, limit: int = 5) -> list[ProductSales]:
+        async with self.ReadSession() as session:
+            result = await session.execute(
+                select(ProductSales)
+                .options(joinedload(ProductSales.product))
+                .order_by(ProductSales.revenue.desc())
+                .limit(limit)
+            )
+            return list(result.scalars().all())
 
     async def check_connection(self) -> bool:
         try:
@@ -250,14 +667,28 @@ class AsyncSQLiteDatabase:
             product = await session.get(Product, product_id)
             await session.delete(product)
             await session.commit()
+        self.catalog.invalidate()
 
     async def edit_product(
         self, product_id, product_parameter, new_parameter_value
     ) -> None:
         async with self.AsyncSession() as session:
-            product = await session.get(Product, product_id)
+            product = await session.get(Product, int(product_id))
+            # значения приходят из сообщений админа строками, PostgreSQL
+            # (в отличие от SQLite) не приводит их к типу колонки сам
+            column_type = Product.__table__.c[product_parameter].type
+            if column_type.python_type is float:
+                new_parameter_value = float(new_parameter_value)
             setattr(product, product_parameter, new_parameter_value)
             await session.commit()
+        self.catalog.invalidate()
+
+    async def close(self) -> None:
+        if self.write_queue:
+            await self.write_queue.stop()
+        await self.engine.dispose()
+        if self.read_engine:
+            await self.read_engine.dispose()
 
 
 async def init_async_sqlite() -> AsyncSQLiteDatabase | None:
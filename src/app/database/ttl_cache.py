@@ -0,0 +1,34 @@
+import time
+from typing import Any
+
+
+class TTLCache:
+    """Небольшой кэш в памяти процесса с временем жизни записей."""
+
+    def __init__(self, ttl: float, maxsize: int = 10_000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Any, tuple[float, Any]] = {}
+
+    def get(self, key) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key, value) -> None:
+        self._data.pop(key, None)
+        if len(self._data) >= self.maxsize:
+            # вытесняем самую старую запись
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
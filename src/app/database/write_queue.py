@@ -0,0 +1,91 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.config.logger import logger
+
+WriteOperation = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class WriteQueue:
+    """
+    Единственный писатель для SQLite (group commit).
+
+    Операции записи копятся несколько миллисекунд и фиксируются одной транзакцией,
+    каждый вызвавший получает результат своей операции (например, новый Order.id).
+    Если пачка падает, операции повторяются по одной, чтобы ошибка одной
+    не отменяла остальные.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        window_ms: int = 5,
+        max_batch: int = 100,
+    ):
+        self.session_maker = session_maker
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue[tuple[WriteOperation, asyncio.Future] | None] = (
+            asyncio.Queue()
+        )
+        self._task: asyncio.Task | None = None
+
+    async def submit(self, operation: WriteOperation) -> Any:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future))
+        return await future
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._commit(batch)
+            if stopping:
+                return
+
+    async def _commit(self, batch: list[tuple[WriteOperation, asyncio.Future]]):
+        try:
+            async with self.session_maker() as session:
+                results = [await operation(session) for operation, _ in batch]
+                await session.commit()
+        except Exception as e:
+            if len(batch) > 1:
+                logger.warning(f"Ошибка в пачке записей, повтор по одной: {e}")
+                for item in batch:
+                    await self._commit([item])
+            elif not batch[0][1].done():
+                batch[0][1].set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,107 @@
+"""
+Операции с корзиной на разных хранилищах CartStore.
+
+Последовательность действий пользователей фиксирована (seed), поэтому на
+MemoryCartStore итоговое состояние корзин и число обращений к хранилищу
+одинаковы при каждом запуске, а время не зависит от сети. С --redis-url
+тот же сценарий прогоняется на настоящем Redis для сравнения.
+
+Запуск: python -m src.benchmarks.cart_store [--redis-url redis://localhost:6379/15]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+
+from redis.asyncio import Redis
+
+from src.app.bot.services.cart_service import Cart, cart_total
+from src.app.bot.services.cart_store import CartStore, MemoryCartStore, RedisCartStore
+
+PRODUCTS = [
+    SimpleNamespace(
+        id=product_id,
+        name=f"Пицца {product_id}",
+        emoji="🍕",
+        category="pizza",
+        get_size_price=lambda size, price=10.0 + product_id: (
+            price * 1.4 if size == "large" else price
+        ),
+        get_size_text=lambda size: "большая" if size == "large" else "стандарт",
+    )
+    for product_id in range(1, 21)
+]
+DB = SimpleNamespace(catalog=SimpleNamespace(version=1))
+
+
+class CountingStore(CartStore):
+    """Считает обращения к хранилищу - одно обращение к Redis на вызов."""
+
+    def __init__(self, store: CartStore):
+        self.store = store
+        self.calls = 0
+
+    async def get(self, cart_key):
+        self.calls += 1
+        return await self.store.get(cart_key)
+
+    async def change_quantity(self, cart_key, field, delta, snapshot, ttl):
+        self.calls += 1
+        return await self.store.change_quantity(cart_key, field, delta, snapshot, ttl)
+
+    async def clear(self, cart_key):
+        self.calls += 1
+        await self.store.clear(cart_key)
+
+
+async def user_session(store: CartStore, user_id: int, actions: int) -> float:
+    rnd = random.Random(user_id)
+    cart = Cart(user_id, store, DB)
+    for _ in range(actions):
+        product = rnd.choice(PRODUCTS)
+        size = rnd.choice(("small", "large"))
+        action = rnd.random()
+        if action < 0.6:
+            await cart.increase(product, size)
+        elif action < 0.85:
+            await cart.decrease(product, size)
+        elif action < 0.95:
+            await cart.get_cart_items()
+        else:
+            await cart.delete(product, size)
+    return cart_total(await cart.get_cart_items())
+
+
+async def run_case(name: str, store: CartStore, args) -> None:
+    counting = CountingStore(store)
+    started = time.perf_counter()
+    totals = await asyncio.gather(
+        *(
+            user_session(counting, user_id, args.actions)
+            for user_id in range(1, args.users + 1)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<8} операций/с: {counting.calls / elapsed:>9.1f}  "
+        f"обращений: {counting.calls}  сумма корзин: {sum(totals):.2f} BYN"
+    )
+
+
+async def main(args) -> None:
+    await run_case("memory", MemoryCartStore(), args)
+    if args.redis_url:
+        redis = Redis.from_url(args.redis_url, decode_responses=True)
+        await redis.delete(*(f"cart:{i}" for i in range(1, args.users + 1)))
+        await run_case("redis", RedisCartStore(redis), args)
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--actions", type=int, default=100)
+    parser.add_argument("--redis-url")
+    asyncio.run(main(parser.parse_args()))
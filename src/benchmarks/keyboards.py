@@ -0,0 +1,68 @@
+"""
+Стоимость одного вызова клавиатуры: сборка InlineKeyboardBuilder с упаковкой
+CallbackData каждой кнопки против готовой разметки из markup_cache.
+
+Запуск: python -m src.benchmarks.keyboards [--products 12]
+"""
+
+import argparse
+import timeit
+
+from src.app.bot.keyboards import adm_kb, nav_kb
+from src.app.database.models import Product
+
+
+def make_products(count: int) -> list[Product]:
+    return [
+        Product(
+            id=product_id,
+            name=f"Пицца {product_id}",
+            price_small=20.0,
+            price_large=28.0 if product_id % 3 else None,
+            category="pizza",
+            category_rus="пицца",
+            emoji="🍕",
+        )
+        for product_id in range(1, count + 1)
+    ]
+
+
+def measure(name: str, build, cached, number: int) -> None:
+    build_us = timeit.timeit(build, number=number) / number * 1e6
+    cached_us = timeit.timeit(cached, number=number) / number * 1e6
+    print(
+        f"{name:<20} сборка: {build_us:>8.1f} мкс  из кэша: {cached_us:>6.2f} мкс  "
+        f"x{build_us / cached_us:.0f}"
+    )
+
+
+def main(args) -> None:
+    products = make_products(args.products)
+    cases = [
+        (
+            "main_menu",
+            lambda: nav_kb.build_main_menu(False),
+            lambda: nav_kb.main_menu(None),
+        ),
+        ("catalog", nav_kb.build_catalog, nav_kb.catalog),
+        (
+            "init_category_menu",
+            lambda: nav_kb.build_category_menu(products),
+            lambda: nav_kb.init_category_menu(products, 1),
+        ),
+        (
+            "product_edit",
+            lambda: adm_kb.build_product_edit(products),
+            lambda: adm_kb.product_edit(products, 1),
+        ),
+        ("admin", adm_kb.build_admin, adm_kb.admin),
+    ]
+    for name, build, cached in cases:
+        measure(name, build, cached, args.number)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=12)
+    parser.add_argument("--number", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,132 @@
+"""
+Пропускная способность чтения SQLite при одновременной записи.
+
+Сравнивает движок без настроек (rollback journal, общий пул на чтение и
+запись) и движок с PRAGMA из настроек (WAL, synchronous=NORMAL, mmap, cache,
+busy_timeout) плюс отдельный пул соединений для чтения.
+
+Запуск: python -m src.benchmarks.sqlite_concurrency
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from src.app.bot.services.cart_service import CartItem
+from src.app.database.models import Base
+from src.app.database.sqlite_db import AsyncSQLiteDatabase, sqlite_pragmas
+
+
+async def prepare(db: AsyncSQLiteDatabase) -> None:
+    async with db.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await db.add_user(1, "bench", "Bench", None)
+    product = await db.add_product(
+        name="Пепперони",
+        price_small=20.0,
+        price_large=28.0,
+        category="pizza",
+        category_rus="пицца",
+        description=None,
+        ingredients=None,
+        nutrition=None,
+        emoji="🍕",
+    )
+    await db.add_order(
+        1,
+        [CartItem.from_product(product, "small", 1)],
+        "Bench",
+        "291234567",
+        "улица",
+        None,
+    )
+
+
+async def write_loop(url: str, pragmas: dict, seconds: float, writes) -> None:
+    db = AsyncSQLiteDatabase(url, read_pool_size=0, pragmas=pragmas)
+    cart_items = [CartItem.from_product(await db.get_product_by_id(1), "small", 1)]
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if await db.add_order(1, cart_items, "Bench", "291234567", "улица", None):
+            with writes.get_lock():
+                writes.value += 1
+    await db.close()
+
+
+def writer_process(url: str, pragmas: dict, seconds: float, writes) -> None:
+    # писатель в отдельном процессе, как контейнер fastapi_admin рядом с ботом
+    asyncio.run(write_loop(url, pragmas, seconds, writes))
+
+
+async def reader(db: AsyncSQLiteDatabase, deadline: float) -> tuple[int, int]:
+    reads = errors = 0
+    while time.perf_counter() < deadline:
+        try:
+            # запросы фиксированного размера, чтобы рост таблицы не влиял на результат
+            await db.get_order_full(1)
+            await db.get_user_by_id(1)
+            reads += 1
+        except Exception:
+            errors += 1
+    return reads, errors
+
+
+async def run_case(name: str, url: str, read_pool_size: int, pragmas: dict, args):
+    db = AsyncSQLiteDatabase(url, read_pool_size=read_pool_size, pragmas=pragmas)
+    await prepare(db)
+
+    writes = multiprocessing.Value("i", 0)
+    writers = [
+        multiprocessing.Process(
+            target=writer_process, args=(url, pragmas, args.seconds, writes)
+        )
+        for _ in range(args.writers)
+    ]
+    for process in writers:
+        process.start()
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(reader(db, started + args.seconds) for _ in range(args.readers))
+    )
+    elapsed = time.perf_counter() - started
+    for process in writers:
+        process.join()
+    await db.close()
+
+    reads = sum(result[0] for result in results)
+    errors = sum(result[1] for result in results)
+    print(
+        f"{name:<24} чтений/с: {reads / elapsed:>8.1f}  ошибок чтения: {errors:>5}  "
+        f"записей/с: {writes.value / elapsed:>7.1f}"
+    )
+
+
+async def main(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        await run_case(
+            "rollback journal",
+            f"sqlite+aiosqlite:///{Path(tmp_dir) / 'baseline.db'}",
+            read_pool_size=0,
+            pragmas={},
+            args=args,
+        )
+        await run_case(
+            f"WAL + {args.read_pool_size} читателя",
+            f"sqlite+aiosqlite:///{Path(tmp_dir) / 'tuned.db'}",
+            read_pool_size=args.read_pool_size,
+            pragmas=sqlite_pragmas(),
+            args=args,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--read-pool-size", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
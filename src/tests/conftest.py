@@ -0,0 +1,78 @@
+import os
+
+import pytest
+import pytest_asyncio
+from aiogram.types import Update
+
+from src.app.database.models import Base
+from src.app.database.sqlite_db import AsyncSQLiteDatabase
+
+# например postgresql+asyncpg://postgres@localhost/shop_test, база очищается перед каждым тестом
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+@pytest_asyncio.fixture(params=["sqlite", "postgresql"])
+async def db(request, tmp_path):
+    if request.param == "postgresql":
+        if not TEST_POSTGRES_URL:
+            pytest.skip("TEST_POSTGRES_URL не задан")
+        database = AsyncSQLiteDatabase(TEST_POSTGRES_URL)
+    else:
+        database = AsyncSQLiteDatabase(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield database
+    await database.close()
+
+
+@pytest.fixture
+def add_products():
+    async def add(db: AsyncSQLiteDatabase):
+        products = [
+            ("Пепперони", 20.0, 28.0, "pizza", "пицца", "🍕"),
+            ("Маргарита", 18.0, 25.0, "pizza", "пицца", "🍕"),
+            ("Чизкейк", 7.5, None, "cake", "тортик", "🍰"),
+            ("Картошка фри", 5.0, 7.0, "snack", "закуска", "🍟"),
+            ("Coca-Cola", 3.0, 4.5, "drink", "напиток", "🥤"),
+        ]
+        return [
+            await db.add_product(
+                name=name,
+                price_small=price_small,
+                price_large=price_large,
+                category=category,
+                category_rus=category_rus,
+                description=None,
+                ingredients=None,
+                nutrition=None,
+                emoji=emoji,
+            )
+            for name, price_small, price_large, category, category_rus, emoji in products
+        ]
+
+    return add
+
+
+@pytest.fixture
+def callback_update():
+    def build(data: str, user_id: int = 5) -> Update:
+        return Update.model_validate(
+            {
+                "update_id": 1,
+                "callback_query": {
+                    "id": "42",
+                    "chat_instance": "1",
+                    "data": data,
+                    "from": {"id": user_id, "is_bot": False, "first_name": "Имя"},
+                    "message": {
+                        "message_id": 10,
+                        "date": 0,
+                        "chat": {"id": user_id, "type": "private"},
+                        "text": "меню",
+                    },
+                },
+            }
+        )
+
+    return build
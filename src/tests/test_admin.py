@@ -0,0 +1,73 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.methods import EditMessageText
+
+from src.app.bot.core.callbacks import AdminCallback
+from src.app.bot.handlers.admin_handlers import admin_router
+from src.app.database.models import User
+
+# роутер можно подключить только к одному диспетчеру
+dp = Dispatcher()
+dp.include_router(admin_router)
+
+
+def make_db(is_admin: bool):
+    db = AsyncMock()
+    db.get_user_by_id.return_value = User(
+        id=5, username="user", first_name="Имя", is_admin=is_admin
+    )
+    db.get_daily_sales.return_value = []
+    db.get_top_products.return_value = []
+    return db
+
+
+def make_bot() -> Bot:
+    bot = Bot("123:abc")
+    bot.session.make_request = AsyncMock(return_value=True)
+    return bot
+
+
+def edited_texts(bot: Bot) -> list[str]:
+    return [
+        call.args[1].text
+        for call in bot.session.make_request.await_args_list
+        if isinstance(call.args[1], EditMessageText)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sales_report_requires_admin(callback_update):
+    update = callback_update(AdminCallback.SALES_REPORT())
+
+    bot, db = make_bot(), make_db(is_admin=False)
+    await dp.feed_update(bot, update, db=db)
+    db.get_daily_sales.assert_not_awaited()
+    assert not any("ОТЧЁТ" in text for text in edited_texts(bot))
+
+    bot, db = make_bot(), make_db(is_admin=True)
+    await dp.feed_update(bot, update, db=db)
+    db.get_daily_sales.assert_awaited_once()
+    assert edited_texts(bot)[0].startswith("ОТЧЁТ ПО ПРОДАЖАМ")
+
+
+@pytest.mark.asyncio
+async def test_broadcast_requires_admin(callback_update):
+    broadcasts = AsyncMock()
+    broadcasts.progress.return_value = None
+
+    for data in (AdminCallback.BROADCAST(), AdminCallback.BROADCAST_CANCEL()):
+        await dp.feed_update(
+            make_bot(), callback_update(data), db=make_db(False), broadcasts=broadcasts
+        )
+    broadcasts.progress.assert_not_awaited()
+    broadcasts.cancel.assert_not_awaited()
+
+    await dp.feed_update(
+        make_bot(),
+        callback_update(AdminCallback.BROADCAST_CANCEL()),
+        db=make_db(True),
+        broadcasts=broadcasts,
+    )
+    broadcasts.cancel.assert_awaited_once()
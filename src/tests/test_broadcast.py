@@ -0,0 +1,136 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+from aiogram.methods import CopyMessage
+from fakeredis import FakeAsyncRedis
+
+from src.app.bot.services.broadcast_service import (
+    ACTIVE_KEY,
+    BroadcastService,
+    broadcast_key,
+)
+
+
+def make_bot(blocked: set[int], broken: set[int]):
+    sent = []
+
+    async def copy_message(chat_id, from_chat_id, message_id):
+        method = CopyMessage(
+            chat_id=chat_id, from_chat_id=from_chat_id, message_id=message_id
+        )
+        if chat_id in blocked:
+            raise TelegramForbiddenError(method, "bot was blocked by the user")
+        if chat_id in broken:
+            raise TelegramBadRequest(method, "chat not found")
+        sent.append(chat_id)
+
+    return SimpleNamespace(copy_message=copy_message, send_message=AsyncMock()), sent
+
+
+@pytest.mark.asyncio
+async def test_broadcast_resumes_and_marks_blocked(db):
+    for user_id in range(1, 8):
+        await db.add_user(user_id, f"user{user_id}", "Имя", None)
+    redis = FakeAsyncRedis(decode_responses=True)
+    bot, sent = make_bot(blocked={3, 6}, broken={5})
+    broadcasts = BroadcastService(redis, db, chunk_size=2, rate=1000)
+
+    broadcast_id = await broadcasts.start(bot, from_chat_id=1, message_id=10)
+    assert await broadcasts.start(bot, from_chat_id=1, message_id=10) is None
+    # "перезапуск": задача отменена после первой пачки, прогресс в Redis
+    await broadcasts.stop()
+    key = broadcast_key(broadcast_id)
+    await redis.hset(key, mapping={"cursor": 2, "sent": 2})
+    sent.clear()
+
+    await BroadcastService(redis, db, chunk_size=2, rate=1000)._run(bot, broadcast_id)
+
+    assert sent == [4, 7]
+    state = await redis.hgetall(key)
+    assert (state["status"], state["sent"], state["blocked"], state["failed"]) == (
+        "done",
+        "4",
+        "2",
+        "1",
+    )
+    assert await redis.lrange(f"{key}:failures", 0, -1) == [
+        "5: Telegram server says - chat not found"
+    ]
+    assert await redis.get(ACTIVE_KEY) is None
+    bot.send_message.assert_awaited_once()
+
+    # заблокировавшие бота пропускаются в следующих рассылках
+    assert await db.get_user_ids_chunk(0, 100) == [1, 2, 4, 5, 7]
+    assert await db.count_active_users() == 5
+
+    # вернувшийся пользователь снова получает рассылки
+    await db.upsert_user(
+        SimpleNamespace(id=3, username="user3", first_name="Имя", last_name=None)
+    )
+    assert await db.get_user_ids_chunk(2, 2) == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_only_one_concurrent_start(db):
+    await db.add_user(1, "user1", "Имя", None)
+    redis = FakeAsyncRedis(decode_responses=True)
+    bot, _ = make_bot(blocked=set(), broken=set())
+    # два воркера с общим Redis
+    workers = [BroadcastService(redis, db, rate=1000) for _ in range(2)]
+
+    started = await asyncio.gather(
+        *(worker.start(bot, from_chat_id=1, message_id=10) for worker in workers)
+    )
+    for worker in workers:
+        await worker.stop()
+
+    assert sum(broadcast_id is not None for broadcast_id in started) == 1
+
+
+@pytest.mark.asyncio
+async def test_restart_right_after_cancel(db):
+    for user_id in range(1, 5):
+        await db.add_user(user_id, f"user{user_id}", "Имя", None)
+    redis = FakeAsyncRedis(decode_responses=True)
+    bot, _ = make_bot(blocked=set(), broken=set())
+    copy_message = bot.copy_message
+
+    async def slow_copy_message(**kwargs):
+        await asyncio.sleep(0.05)
+        await copy_message(**kwargs)
+
+    bot.copy_message = slow_copy_message
+    broadcasts = BroadcastService(redis, db, chunk_size=2, rate=1000)
+
+    first = await broadcasts.start(bot, from_chat_id=1, message_id=10)
+    await asyncio.sleep(0.01)
+    # отмена посреди пачки и сразу новая рассылка
+    await broadcasts.cancel()
+    second = await broadcasts.start(bot, from_chat_id=1, message_id=11)
+    assert second is not None
+
+    await broadcasts._task
+    assert await redis.hget(broadcast_key(first), "status") == "cancelled"
+    assert await redis.hget(broadcast_key(second), "status") == "done"
+    assert await broadcasts.start(bot, from_chat_id=1, message_id=12) is not None
+    await broadcasts.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_broadcast_releases_slot(db):
+    redis = FakeAsyncRedis(decode_responses=True)
+    bot, _ = make_bot(blocked=set(), broken=set())
+    broadcasts = BroadcastService(redis, db)
+    broadcasts.db = AsyncMock(wraps=db)
+    broadcasts.db.get_user_ids_chunk.side_effect = RuntimeError("БД недоступна")
+
+    broadcast_id = await broadcasts.start(bot, from_chat_id=1, message_id=10)
+    await broadcasts._task
+
+    assert await redis.hget(broadcast_key(broadcast_id), "status") == "failed"
+    assert await broadcasts.progress() is None
+    assert await broadcasts.start(bot, from_chat_id=1, message_id=11) is not None
+    await broadcasts.stop()
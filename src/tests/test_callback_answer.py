@@ -0,0 +1,42 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram import Bot, Dispatcher, F, Router, flags
+from aiogram.methods import AnswerCallbackQuery
+from aiogram.types import CallbackQuery
+
+from src.app.bot.middlewares import CallbackAnswerMiddleware
+
+
+@pytest.mark.asyncio
+async def test_callback_answered_before_handler_finishes(callback_update):
+    bot = Bot("123:abc")
+    bot.session.make_request = AsyncMock(return_value=True)
+    answered_during_handler = []
+    router = Router()
+
+    @router.callback_query(F.data == "slow")
+    async def slow(callback: CallbackQuery):
+        await asyncio.sleep(0.01)
+        answered_during_handler.append(bot.session.make_request.await_count)
+
+    @router.callback_query(F.data == "alert")
+    @flags.callback_answer(disabled=True)
+    async def alert(callback: CallbackQuery):
+        await callback.answer("Контакты", show_alert=True)
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    dp.callback_query.middleware(CallbackAnswerMiddleware())
+
+    await dp.feed_update(bot, callback_update("slow"))
+    assert answered_during_handler == [1]
+
+    # обработчик с отказом от автоответа отвечает сам, один раз
+    bot.session.make_request.reset_mock()
+    await dp.feed_update(bot, callback_update("alert"))
+    (_, method), _ = bot.session.make_request.await_args
+    assert bot.session.make_request.await_count == 1
+    assert isinstance(method, AnswerCallbackQuery)
+    assert (method.text, method.show_alert) == ("Контакты", True)
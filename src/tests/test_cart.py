@@ -1,11 +1,41 @@
+import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
+from fakeredis import FakeAsyncRedis
 
-from src.app.bot.services.cart_service import Cart
+from src.app.bot.services.cart_service import (
+    Cart,
+    cart_total,
+    parse_cart,
+)
+from src.app.bot.services.cart_store import MemoryCartStore, RedisCartStore
+from src.app.config.settings import settings
 
 # self.cart_key = f"cart:{user_id}"
-# self.amount_key = f"cart_amount:{user_id}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["redis", "memory"])
+def store(request):
+    if request.param == "redis":
+        return RedisCartStore(FakeAsyncRedis(decode_responses=True))
+    return MemoryCartStore()
+
+
+async def cart_ttl(store) -> float:
+    if isinstance(store, RedisCartStore):
+        return await store.redis.ttl("cart:123")
+    expires_at, _ = store._carts["cart:123"]
+    return expires_at - store.clock()
 
 
 @pytest.mark.asyncio
@@ -13,29 +43,101 @@ async def test_cart_clear():
     mock_redis = AsyncMock()
     mock_db = AsyncMock()
 
-    cart = Cart(user_id=123, redis=mock_redis, db=mock_db)
+    cart = Cart(user_id=123, store=RedisCartStore(mock_redis), db=mock_db)
 
     await cart.clear()
-    mock_redis.delete.assert_any_call("cart:123")
-    mock_redis.delete.assert_any_call("cart_amount:123")
-
-    # async def add_price_amount(self, price: float):
-    #     await self.redis.incrbyfloat(self.amount_key, price)
-    #     await self.redis.expire(self.amount_key, 3600 * 12)
-    #     await self.redis.expire(self.cart_key, 3600 * 12)
+    mock_redis.delete.assert_awaited_once_with("cart:123")
+
+
+def make_product(product_id, name, category, price):
+    return SimpleNamespace(
+        id=product_id,
+        name=name,
+        emoji="🍕",
+        category=category,
+        get_size_price=lambda size: price,
+        get_size_text=lambda size: size,
+    )
+
+
+def line(quantity, price, name, category, version="1"):
+    return json.dumps(
+        {
+            "q": quantity,
+            "p": price,
+            "n": name,
+            "e": "🍕",
+            "c": category,
+            "s": "",
+            "v": version,
+        }
+    )
 
 
 @pytest.mark.asyncio
-async def test_cart_hincrby():
-    mock_redis = AsyncMock()
-    mock_db = AsyncMock()
+async def test_cart_change_quantity(store):
+    pizza = make_product(1, "Пепперони", "pizza", 28.5)
+    drink = make_product(2, "Coca-Cola", "drink", 3.0)
+    db = SimpleNamespace(catalog=SimpleNamespace(version=7))
+    cart = Cart(user_id=123, store=store, db=db)
+
+    assert (await cart.increase(pizza, "large"))[0] == 1
+    assert (await cart.increase(pizza, "large"))[0] == 2
+    quantity, items = await cart.increase(drink, "small")
+    assert quantity == 1
+    assert [(i.product_id, i.size, i.quantity, i.price) for i in items] == [
+        (1, "large", 2, 2850),
+        (2, "small", 1, 300),
+    ]
+    assert items[0].name == "Пепперони"
+    assert items[0].catalog_version == "7"
+    # сумма считается в копейках, без погрешности float
+    assert cart_total(items) == 60.0
+    assert await cart.get_current_price_amount() == 60.0
+    assert 0 < await cart_ttl(store) <= settings.CART_TTL
+
+    # уменьшение с 1 удаляет позицию
+    quantity, items = await cart.decrease(drink, "small")
+    assert (quantity, cart_total(items)) == (0, 57.0)
+
+    # снимок позиции обновляется при изменении, если её поменяли в каталоге
+    pizza.get_size_price = lambda size: 30.0
+    pizza.name = "Пепперони XL"
+    quantity, items = await cart.decrease(pizza, "large")
+    assert [(i.name, i.quantity, i.price) for i in items] == [("Пепперони XL", 1, 3000)]
+
+    assert await cart.delete(pizza, "large") == (0, ())
+    assert await store.get("cart:123") == {}
+    if isinstance(store, RedisCartStore):
+        assert await store.redis.exists("cart:123") == 0
+    else:
+        assert store._carts == {}
 
-    cart = Cart(user_id=123, redis=mock_redis, db=mock_db)
 
-    await cart.add_price_amount(123.45)
-    mock_redis.incrbyfloat.assert_any_call("cart_amount:123", 123.45)
-    mock_redis.expire.assert_any_call("cart_amount:123", 3600 * 12)
-    mock_redis.expire.assert_any_call("cart:123", 3600 * 12)
+@pytest.mark.asyncio
+async def test_memory_cart_store_ttl():
+    clock = FakeClock()
+    store = MemoryCartStore(clock)
+    snapshot = '{"p": 100}'
+
+    await store.change_quantity("cart:1", "product:1:small", 1, snapshot, ttl=10)
+    clock.now = 5
+    await store.change_quantity("cart:2", "product:1:small", 1, snapshot, ttl=10)
+    # удаление позиции и чтение TTL не продлевают
+    await store.change_quantity("cart:1", "product:2:small", "delete", snapshot, ttl=10)
+    clock.now = 9
+    assert await store.get("cart:1") == {"product:1:small": '{"p": 100, "q": 1}'}
+
+    clock.now = 10
+    assert await store.get("cart:1") == {}
+    assert list(store._carts) == ["cart:2"]
+
+    # изменение количества продлевает TTL
+    await store.change_quantity("cart:2", "product:1:small", 1, snapshot, ttl=10)
+    clock.now = 19
+    assert await store.get("cart:2") == {"product:1:small": '{"p": 100, "q": 2}'}
+    clock.now = 20
+    assert await store.get("cart:2") == {}
 
 
 @pytest.mark.asyncio
@@ -44,47 +146,45 @@ async def test_get_cart_items():
     mock_db = AsyncMock()
 
     mock_redis.hgetall.return_value = {
-        "product:1:large": "1",
-        "product:2:small": "2",
-        "product:3:small": "3",
-        "product:4:small": "4",
+        "product:1:large": line(1, 2800, "Пепперони", "pizza"),
+        "product:2:small": line(2, 500, "Картошка фри", "snack"),
+        "product:3:small": line(3, 300, "Coca-Cola", "drink"),
+        "product:4:small": line(4, 750, "Чизкейк", "cake"),
+        # позиции старого формата без снимка пропускаются
+        "product:5:small": "2",
+        "product:6:small": '{"q": 1, "p": 2800}',
     }
 
-    mock_product_1 = AsyncMock()
-    mock_product_1.category = "pizza"
-    mock_product_1.name = "Пепперони"
-
-    mock_product_2 = AsyncMock()
-    mock_product_2.category = "snack"
-    mock_product_2.name = "Картошка фри"
-
-    mock_product_3 = AsyncMock()
-    mock_product_3.category = "drink"
-    mock_product_3.name = "Coca-Cola"
-
-    mock_product_4 = AsyncMock()
-    mock_product_4.category = "cake"
-    mock_product_4.name = "Чизкейк"
-
-    mock_db.get_product_by_id.side_effect = [
-        mock_product_1,
-        mock_product_2,
-        mock_product_3,
-        mock_product_4,
-    ]
-
-    cart = Cart(user_id=123, redis=mock_redis, db=mock_db)
+    cart = Cart(user_id=123, store=RedisCartStore(mock_redis), db=mock_db)
 
     items = await cart.get_cart_items()
 
-    assert len(items) == 4
+    # корзина собирается из снимков, без запросов к БД
+    assert mock_db.mock_calls == []
+    assert [item.category for item in items] == ["pizza", "snack", "cake", "drink"]
+    assert items[0].name == "Пепперони"
+    assert cart_total(items) == 28.0 + 2 * 5.0 + 3 * 3.0 + 4 * 7.5
 
-    mock_db.get_product_by_id.assert_any_call("1")
-    mock_db.get_product_by_id.assert_any_call("2")
-    mock_db.get_product_by_id.assert_any_call("3")
-    mock_db.get_product_by_id.assert_any_call("4")
 
-    assert items[0][0].category == "pizza"
-    assert items[1][0].category == "snack"
-    assert items[2][0].category == "cake"
-    assert items[3][0].category == "drink"
+@pytest.mark.asyncio
+async def test_revalidate():
+    pizza = make_product(1, "Пепперони", "pizza", 30.0)
+    catalog = SimpleNamespace(version=2, get={1: pizza}.get)
+    db = SimpleNamespace(get_catalog=AsyncMock(return_value=catalog))
+    cart = Cart(user_id=123, store=MemoryCartStore(), db=db)
+
+    items = parse_cart(
+        {
+            "product:1:large": line(2, 2800, "Пепперони", "pizza", version="2"),
+            "product:2:small": line(1, 300, "Coca-Cola", "drink", version="2"),
+        }
+    )
+    # версия каталога не менялась - снимкам можно верить
+    assert await cart.revalidate(items) == (items, False)
+
+    catalog.version = 3
+    actual, changed = await cart.revalidate(items)
+    # цена пиццы обновилась, удалённый из каталога напиток убран
+    assert changed
+    assert [(i.product_id, i.quantity, i.price) for i in actual] == [(1, 2, 3000)]
+    assert actual[0].catalog_version == "3"
@@ -0,0 +1,101 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram import Bot, Dispatcher, F, Router, flags
+from aiogram.types import CallbackQuery
+
+from src.app.bot.middlewares import CancelDebouncedMiddleware
+from src.app.bot.services.debounce import Debouncer
+
+
+@pytest.mark.asyncio
+async def test_burst_runs_last_action_once():
+    debouncer = Debouncer(0.02)
+    rendered = []
+
+    def render(value):
+        async def action():
+            rendered.append(value)
+
+        return action
+
+    for value in range(5):
+        debouncer.schedule(5, render(value))
+    debouncer.schedule(6, render("другой пользователь"))
+    await asyncio.sleep(0.05)
+    assert sorted(rendered, key=str) == [4, "другой пользователь"]
+
+    # после окна - новая перерисовка
+    debouncer.schedule(5, render(5))
+    await debouncer.close()
+    assert rendered[-1] == 5
+
+
+@pytest.mark.asyncio
+async def test_schedule_during_action_waits_for_it():
+    debouncer = Debouncer(0.01)
+    running = []
+
+    async def slow():
+        running.append("start")
+        await asyncio.sleep(0.03)
+        running.append("end")
+
+    async def fast():
+        running.append("fast")
+
+    debouncer.schedule(5, slow)
+    await asyncio.sleep(0.02)
+    debouncer.schedule(5, fast)
+    await debouncer.close()
+    assert running == ["start", "end", "fast"]
+
+
+@pytest.mark.asyncio
+async def test_other_button_cancels_pending_render(callback_update):
+    debouncer = Debouncer(0.05)
+    action = AsyncMock()
+    router = Router()
+
+    @router.callback_query(F.data == "plus")
+    @flags.debounced
+    async def plus(callback: CallbackQuery):
+        debouncer.schedule(callback.from_user.id, action)
+
+    @router.callback_query(F.data == "order")
+    async def order(callback: CallbackQuery):
+        pass
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    dp.callback_query.middleware(CancelDebouncedMiddleware(debouncer))
+    bot = Bot("123:abc")
+
+    await dp.feed_update(bot, callback_update("plus"))
+    await dp.feed_update(bot, callback_update("plus"))
+    await debouncer.close()
+    assert action.await_count == 1
+
+    await dp.feed_update(bot, callback_update("plus"))
+    await dp.feed_update(bot, callback_update("order"))
+    await debouncer.close()
+    assert action.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cancel_does_not_interrupt_started_action():
+    debouncer = Debouncer(0.01)
+    running = []
+
+    async def slow():
+        running.append("start")
+        await asyncio.sleep(0.03)
+        running.append("end")
+
+    debouncer.schedule(5, slow)
+    await asyncio.sleep(0.02)
+    # правка уже отправляется - её не прерываем
+    debouncer.cancel(5)
+    await debouncer.close()
+    assert running == ["start", "end"]
@@ -0,0 +1,86 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import DeleteMessage, EditMessageText
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+from fakeredis import FakeAsyncRedis
+
+from src.app.bot.middlewares import SkipUnchangedEditMiddleware
+
+
+def edit(text: str, button: str = "Назад") -> EditMessageText:
+    builder = InlineKeyboardBuilder()
+    builder.button(text=button, callback_data="back")
+    return EditMessageText(
+        chat_id=5, message_id=10, text=text, reply_markup=builder.as_markup()
+    )
+
+
+@pytest.fixture
+def middleware():
+    return SkipUnchangedEditMiddleware(FakeAsyncRedis(decode_responses=True))
+
+
+@pytest.mark.asyncio
+async def test_same_edit_is_skipped(middleware):
+    make_request = AsyncMock(return_value=True)
+
+    await middleware(make_request, None, edit("Корзина"))
+    response = await middleware(make_request, None, edit("Корзина"))
+    assert response.result is True
+    assert make_request.await_count == 1
+    assert middleware.skipped == 1
+
+    # изменился текст или клавиатура - правка уходит в Telegram
+    await middleware(make_request, None, edit("Корзина (2)"))
+    await middleware(make_request, None, edit("Корзина (2)", button="Меню"))
+    assert make_request.await_count == 3
+
+    # после удаления сообщения отпечаток не действует
+    await middleware(make_request, None, DeleteMessage(chat_id=5, message_id=10))
+    await middleware(make_request, None, edit("Корзина (2)", button="Меню"))
+    assert make_request.await_count == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_edit_forgets_fingerprint(middleware):
+    method = edit("Корзина")
+    make_request = AsyncMock(
+        side_effect=TelegramBadRequest(method, "message to edit not found")
+    )
+    with pytest.raises(TelegramBadRequest):
+        await middleware(make_request, None, method)
+
+    make_request = AsyncMock(return_value=True)
+    await middleware(make_request, None, edit("Корзина"))
+    assert make_request.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_not_modified_is_success(middleware):
+    method = edit("Корзина")
+    make_request = AsyncMock(
+        side_effect=TelegramBadRequest(
+            method, "Bad Request: message is not modified: specified new message"
+        )
+    )
+    response = await middleware(make_request, None, method)
+    assert response.ok
+
+
+@pytest.mark.asyncio
+async def test_cancelled_edit_forgets_fingerprint(middleware):
+    async def wait_forever(bot, method):
+        await asyncio.Event().wait()
+
+    task = asyncio.create_task(middleware(wait_forever, None, edit("Корзина")))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    make_request = AsyncMock(return_value=True)
+    await middleware(make_request, None, edit("Корзина"))
+    assert make_request.await_count == 1
@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+
+import pytest
+
+from src.app.api.services import export_service as es
+from src.app.bot.services.cart_service import CartItem
+
+
+async def collect(chunks) -> str:
+    return "".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_export_orders(db, add_products):
+    products = await add_products(db)
+    await db.add_user(1, "user", "Имя", None)
+    first = await db.add_order(
+        1,
+        [
+            CartItem.from_product(products[0], "large", 2),
+            CartItem.from_product(products[4], "small", 1),
+        ],
+        "Имя",
+        "291234567",
+        "улица, дом 1",
+        None,
+    )
+    second = await db.add_order(
+        1,
+        [CartItem.from_product(products[3], "small", 1)],
+        "Имя",
+        "291234567",
+        "-",
+        None,
+    )
+
+    rows = list(csv.DictReader(io.StringIO(await collect(es.orders_csv(db)))))
+    assert [(int(r["id"]), r["product_name"]) for r in rows] == [
+        (first.id, "Пепперони"),
+        (first.id, "Coca-Cola"),
+        (second.id, "Картошка фри"),
+    ]
+
+    lines = (await collect(es.orders_ndjson(db))).splitlines()
+    orders = [json.loads(line) for line in lines]
+    assert [order["id"] for order in orders] == [first.id, second.id]
+    assert [item["quantity"] for item in orders[0]["items"]] == [2, 1]
+    assert orders[0]["amount"] == 28.0 * 2 + 3.0
+
+
+@pytest.mark.asyncio
+async def test_export_users_in_batches(db):
+    for user_id in range(1, 6):
+        await db.add_user(user_id, f"user{user_id}", "Имя", None)
+
+    batches = [batch async for batch in db.stream_users(batch_size=2)]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    rows = list(csv.DictReader(io.StringIO(await collect(es.users_csv(db)))))
+    assert [row["username"] for row in rows] == [f"user{i}" for i in range(1, 6)]
+    users = [
+        json.loads(line) for line in (await collect(es.users_ndjson(db))).splitlines()
+    ]
+    assert users[0]["id"] == 1
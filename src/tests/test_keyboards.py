@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from src.app.bot.core.callbacks import MenuNavigationCallback, ProductCallback
+from src.app.bot.keyboards import adm_kb, nav_kb
+from src.app.database.models import Product
+
+
+def make_product(product_id: int, price_small: float) -> Product:
+    return Product(
+        id=product_id,
+        name=f"Пицца {product_id}",
+        price_small=price_small,
+        price_large=None,
+        category="pizza",
+        category_rus="пицца",
+        emoji="🍕",
+    )
+
+
+def test_callback_data_is_packed():
+    assert MenuNavigationCallback.CART() == "menu:cart"
+    callback = ProductCallback.unpack(ProductCallback.add_small_size(1))
+    assert (callback.action, callback.product_id, callback.size) == (
+        "add_to_cart",
+        1,
+        "small",
+    )
+
+
+def test_markup_cache_by_role():
+    user = SimpleNamespace(is_admin=False)
+    admin = SimpleNamespace(is_admin=True)
+
+    assert nav_kb.main_menu(user) is nav_kb.main_menu(None)
+    assert nav_kb.main_menu(admin) is not nav_kb.main_menu(user)
+    buttons = [b.text for row in nav_kb.main_menu(admin).inline_keyboard for b in row]
+    assert "👺 АДМИНПАНЕЛЬ" in buttons
+    assert adm_kb.admin() is adm_kb.admin()
+
+
+def test_markup_cache_by_catalog_version():
+    products = [make_product(1, 20.0), make_product(2, 18.0)]
+    markup = nav_kb.init_category_menu(products, catalog_version=1)
+    assert nav_kb.init_category_menu(products, catalog_version=1) is markup
+
+    # новая версия каталога - клавиатура собирается заново с новыми ценами
+    products[0].price_small = 22.0
+    markup = nav_kb.init_category_menu(products, catalog_version=2)
+    assert markup.inline_keyboard[0][1].text.endswith("22.0 BYN")
+    assert adm_kb.product_edit(products, 2) is not adm_kb.product_delete(products, 2)
@@ -0,0 +1,84 @@
+import subprocess
+import sys
+
+import pytest
+from aiogram import Bot, Dispatcher, F, Router
+from aiogram.types import Message, Update
+from prometheus_client import REGISTRY
+
+from src.app.bot.dispatcher import setup_metrics
+
+
+def message_update(text: str) -> Update:
+    return Update.model_validate(
+        {
+            "update_id": 1,
+            "message": {
+                "message_id": 1,
+                "date": 0,
+                "chat": {"id": 5, "type": "private"},
+                "from": {"id": 5, "is_bot": False, "first_name": "Имя"},
+                "text": text,
+            },
+        }
+    )
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.asyncio
+async def test_update_metrics_by_handler():
+    router = Router(name="metrics_test")
+
+    @router.message(F.text == "ok")
+    async def metrics_ok(message: Message):
+        pass
+
+    @router.message(F.text == "fail")
+    async def metrics_fail(message: Message):
+        raise ValueError("ошибка")
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    setup_metrics(dp)
+    bot = Bot("123:abc")
+    labels = {"router": "metrics_test", "handler": "metrics_ok"}
+    before = sample("bot_update_seconds_count", **labels)
+
+    await dp.feed_update(bot, message_update("ok"))
+    await dp.feed_update(bot, message_update("ok"))
+    with pytest.raises(ValueError):
+        await dp.feed_update(bot, message_update("fail"))
+
+    assert sample("bot_update_seconds_count", **labels) == before + 2
+    assert (
+        sample(
+            "bot_update_errors_total",
+            router="metrics_test",
+            handler="metrics_fail",
+            error="ValueError",
+        )
+        == 1
+    )
+    assert sample("bot_updates_in_flight") == 0
+
+
+API_METRICS_SCRIPT = """
+import prometheus_client
+import src.app.api.main
+print(prometheus_client.generate_latest().decode())
+"""
+
+
+def test_api_process_exports_only_api_metrics():
+    # в тестах импортированы оба модуля, поэтому реестр API проверяется в отдельном процессе
+    output = subprocess.run(
+        [sys.executable, "-c", API_METRICS_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert "api_request_seconds" in output
+    assert "bot_" not in output
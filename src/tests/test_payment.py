@@ -0,0 +1,38 @@
+import pytest
+
+from src.app.bot.handlers.payment_handlers import invoice_prices
+from src.app.bot.services.cart_service import CartItem
+
+
+@pytest.mark.asyncio
+async def test_invoice_prices_in_whole_kopecks(db):
+    await db.add_user(1, "user", "Имя", None)
+    products = [
+        await db.add_product(
+            name=name,
+            price_small=price,
+            price_large=None,
+            category="drink",
+            category_rus="напиток",
+            description=None,
+            ingredients=None,
+            nutrition=None,
+            emoji="🥤",
+        )
+        for name, price in (("Морс", 19.9), ("Сок", 4.35))
+    ]
+    order = await db.add_order(
+        1,
+        [
+            CartItem.from_product(products[0], "small", 2),
+            CartItem.from_product(products[1], "small", 1),
+        ],
+        "Имя",
+        "291234567",
+        "-",
+        None,
+    )
+
+    # 19.9 * 100 в float - 1989.99..., LabeledPrice такое не принимает
+    prices = invoice_prices(await db.get_order_full(order.id))
+    assert sorted(price.amount for price in prices) == [435, 3980]
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import AnswerCallbackQuery, SendMessage
+from fakeredis import FakeAsyncRedis
+
+from src.app.bot.dispatcher import create_bot
+from src.app.bot.middlewares import RateLimitMiddleware
+from src.app.config.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_chat_limit_queues_requests():
+    middleware = RateLimitMiddleware(chat_rate=20, chat_burst=2)
+    make_request = AsyncMock(return_value="ok")
+    method = SendMessage(chat_id=5, text="привет")
+
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *(middleware(make_request, None, method) for _ in range(4))
+    )
+    elapsed = time.monotonic() - started
+
+    # два запроса из запаса сразу, ещё два - с интервалом 1/20 с
+    assert results == ["ok"] * 4
+    assert 0.09 <= elapsed < 0.5
+    assert middleware.queue_depth == 0
+
+    # другой чат и запросы без chat_id не ждут
+    started = time.monotonic()
+    await middleware(make_request, None, SendMessage(chat_id=6, text="привет"))
+    await middleware(make_request, None, AnswerCallbackQuery(callback_query_id="1"))
+    assert time.monotonic() - started < 0.04
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_retried():
+    middleware = RateLimitMiddleware(chat_rate=100, max_retries=1, retry_jitter=0)
+    method = SendMessage(chat_id=5, text="привет")
+    make_request = AsyncMock(
+        side_effect=[TelegramRetryAfter(method, "flood", retry_after=0), "ok"]
+    )
+
+    assert await middleware(make_request, None, method) == "ok"
+    assert make_request.await_count == 2
+
+    make_request = AsyncMock(
+        side_effect=TelegramRetryAfter(method, "flood", retry_after=0)
+    )
+    with pytest.raises(TelegramRetryAfter):
+        await middleware(make_request, None, method)
+    assert make_request.await_count == 2
+
+
+def test_global_limit_shared_between_webhook_workers(monkeypatch):
+    monkeypatch.setattr(settings, "BOT_MODE", "webhook")
+    monkeypatch.setattr(settings, "WEBHOOK_WORKERS", 3)
+    bot = create_bot(FakeAsyncRedis())
+    [rate_limit] = [
+        middleware
+        for middleware in bot.session.middleware
+        if isinstance(middleware, RateLimitMiddleware)
+    ]
+    # три процесса вместе не превышают RATE_LIMIT_GLOBAL
+    assert rate_limit.global_bucket.rate == settings.RATE_LIMIT_GLOBAL / 3
+    assert rate_limit.global_bucket.capacity == settings.RATE_LIMIT_GLOBAL_BURST // 3
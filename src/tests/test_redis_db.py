@@ -0,0 +1,29 @@
+import pytest
+from aiogram.fsm.storage.base import StorageKey
+from fakeredis import FakeAsyncRedis
+
+from src.app.bot.handlers.order_handlers import OrderStates
+from src.app.config.settings import settings
+from src.app.database.redis_db import init_fsm_storage
+
+
+@pytest.mark.asyncio
+async def test_fsm_storage_shared_between_workers():
+    redis = FakeAsyncRedis(decode_responses=True)
+    key = StorageKey(bot_id=42, chat_id=5, user_id=5)
+
+    await init_fsm_storage(redis).set_state(key, OrderStates.phone)
+    await init_fsm_storage(redis).set_data(key, {"name": "Имя"})
+
+    # другой воркер (или бот после перезапуска) видит то же состояние
+    storage = init_fsm_storage(redis)
+    assert await storage.get_state(key) == OrderStates.phone.state
+    assert await storage.get_data(key) == {"name": "Имя"}
+
+    keys = sorted(await redis.keys("*"))
+    assert keys == [
+        f"{settings.FSM_KEY_PREFIX}:42:5:5:data",
+        f"{settings.FSM_KEY_PREFIX}:42:5:5:state",
+    ]
+    assert 0 < await redis.ttl(keys[0]) <= settings.FSM_DATA_TTL
+    assert 0 < await redis.ttl(keys[1]) <= settings.FSM_STATE_TTL
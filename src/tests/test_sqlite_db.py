@@ -0,0 +1,343 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from src.app.bot.services.cart_service import CartItem
+from src.app.database.sqlite_db import AsyncSQLiteDatabase
+from src.app.database.write_queue import WriteQueue
+
+
+@pytest.mark.asyncio
+async def test_catalog_reads_come_from_cache(db, add_products):
+    products = await add_products(db)
+
+    pizzas = await db.get_products_by_category("pizza")
+    assert [p.name for p in pizzas] == ["Пепперони", "Маргарита"]
+
+    snacks = await db.get_products_by_category("snack")
+    assert [p.category for p in snacks] == ["snack", "cake"]
+
+    # после загрузки кэша чтения не открывают сессию
+    db.AsyncSession = db.ReadSession = None
+    product = await db.get_product_by_id(str(products[0].id))
+    assert product.name == "Пепперони"
+    assert [p.name for p in await db.get_products()] == [
+        "Маргарита",
+        "Пепперони",
+        "Картошка фри",
+        "Чизкейк",
+        "Coca-Cola",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_catalog_sorted_case_insensitive(db):
+    for name in ("Яблочный пирог", "банановый пирог", "Ягодный пирог"):
+        await db.add_product(
+            name=name,
+            price_small=5.0,
+            price_large=None,
+            category="cake",
+            category_rus="тортик",
+            description=None,
+            ingredients=None,
+            nutrition=None,
+            emoji="🍰",
+        )
+    # как name.lower() в Python, в том числе для кириллицы в SQLite
+    assert [p.name for p in await db.get_products()] == [
+        "банановый пирог",
+        "Яблочный пирог",
+        "Ягодный пирог",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_catalog_version_bumped_on_changes(db, add_products):
+    products = await add_products(db)
+    await db.get_products()
+    version = db.catalog.version
+
+    await db.edit_product(products[0].id, "name", "Диабло")
+    assert db.catalog.version > version
+    assert (await db.get_product_by_id(products[0].id)).name == "Диабло"
+
+    version = db.catalog.version
+    await db.delete_product(products[0].id)
+    assert db.catalog.version > version
+    assert await db.get_product_by_id(products[0].id) is None
+
+
+@pytest.mark.asyncio
+async def test_catalog_reloaded_after_ttl(db, add_products):
+    products = await add_products(db)
+    await db.get_products()
+    # изменение, сделанное другим процессом, минуя этот кэш
+    other = AsyncSQLiteDatabase(db.engine.url.render_as_string(hide_password=False))
+    await other.edit_product(products[0].id, "name", "Диабло")
+    await other.close()
+    assert (await db.get_product_by_id(products[0].id)).name == "Пепперони"
+
+    db.catalog.ttl = 0.01
+    await asyncio.sleep(0.02)
+    assert (await db.get_product_by_id(products[0].id)).name == "Диабло"
+
+
+@pytest.mark.asyncio
+async def test_get_order_full(db, add_products):
+    products = await add_products(db)
+    await db.add_user(1, "user", "Имя", None)
+    order = await db.add_order(
+        1,
+        [
+            CartItem.from_product(products[0], "large", 2),
+            CartItem.from_product(products[4], "small", 1),
+        ],
+        "Имя",
+        "291234567",
+        "улица Ленина, дом 1",
+        None,
+    )
+    assert order.amount == 28.0 * 2 + 3.0
+
+    full_order = await db.get_order_full(order.id)
+    # связи загружены заранее и доступны после закрытия сессии
+    items = sorted(full_order.order_items, key=lambda x: x.id)
+    assert [(item.product.name, item.size) for item in items] == [
+        ("Пепперони", "large"),
+        ("Coca-Cola", "small"),
+    ]
+    assert await db.get_order_full(999) is None
+
+
+@pytest.mark.asyncio
+async def test_group_commit(db, add_products):
+    products = await add_products(db)
+    await db.add_user(1, "user", "Имя", None)
+    db.write_queue = WriteQueue(db.AsyncSession, window_ms=20)
+    commits = []
+    event.listen(db.engine.sync_engine, "commit", lambda conn: commits.append(1))
+
+    async def broken_operation(session):
+        raise ValueError("broken")
+
+    results = await asyncio.gather(
+        *(
+            db.add_order(
+                1,
+                [CartItem.from_product(products[0], "small", 1)],
+                "Имя",
+                "291234567",
+                "-",
+                None,
+            )
+            for _ in range(10)
+        ),
+        db.write(broken_operation),
+        return_exceptions=True,
+    )
+    orders, error = results[:-1], results[-1]
+
+    assert isinstance(error, ValueError)
+    assert len({order.id for order in orders}) == 10
+    # одна пачка упала целиком и была повторена по одной операции
+    assert len(commits) == 10
+    assert len(await db.get_orders_by_user(1)) == 10
+
+    commits.clear()
+    await asyncio.gather(*(db.order_set_done(order.id) for order in orders))
+    assert len(commits) == 1
+    assert {o.status for o in await db.get_orders_by_user(1)} == {"done"}
+
+
+@pytest.mark.asyncio
+async def test_orders_keyset_pagination(db, add_products):
+    products = await add_products(db)
+    await db.add_user(1, "user", "Имя", None)
+    await db.add_user(2, "other", "Другой", None)
+    ids = []
+    for user_id in [1, 2, 1, 1, 2, 1, 1]:
+        order = await db.add_order(
+            user_id,
+            [CartItem.from_product(products[0], "small", 1)],
+            "Имя",
+            "291234567",
+            "-",
+            None,
+        )
+        if user_id == 1:
+            ids.append(order.id)
+    newest_first = ids[::-1]
+
+    first = await db.get_orders_by_user(1, limit=2)
+    assert [o.id for o in first] == newest_first[:2]
+    second = await db.get_orders_by_user(1, cursor=first[-1].id, limit=2)
+    assert [o.id for o in second] == newest_first[2:4]
+    last = await db.get_orders_by_user(1, cursor=second[-1].id, limit=2)
+    assert [o.id for o in last] == newest_first[4:]
+
+    back = await db.get_orders_by_user(1, cursor=second[0].id, limit=2, backward=True)
+    assert [o.id for o in back] == newest_first[:2]
+
+
+@pytest.mark.asyncio
+async def test_orders_first_page_cache(db, add_products):
+    products = await add_products(db)
+    await db.add_user(1, "user", "Имя", None)
+    order = await db.add_order(
+        1,
+        [CartItem.from_product(products[0], "small", 1)],
+        "Имя",
+        "291234567",
+        "-",
+        None,
+    )
+
+    assert [o.id for o in await db.get_orders_by_user(1, limit=10)] == [order.id]
+    # повторное открытие первой страницы не обращается к БД
+    read_session, db.ReadSession = db.ReadSession, None
+    assert [o.id for o in await db.get_orders_by_user(1, limit=10)] == [order.id]
+
+    # изменение заказа сбрасывает кэш пользователя
+    await db.order_set_done(order.id)
+    db.ReadSession = read_session
+    assert [o.status for o in await db.get_orders_by_user(1, limit=10)] == ["done"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_user_writes_only_changes(db):
+    tg_user = SimpleNamespace(id=5, username="user", first_name="Имя", last_name=None)
+    statements = []
+    event.listen(
+        db.engine.sync_engine,
+        "after_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(
+            (statement.split()[0], cursor.rowcount)
+        ),
+    )
+
+    user = await db.upsert_user(tg_user)
+    assert (user.username, user.is_admin) == ("user", False)
+
+    statements.clear()
+    user = await db.upsert_user(tg_user)
+    assert user.username == "user"
+    # INSERT ... ON CONFLICT ничего не изменил, пользователь прочитан отдельно
+    assert statements[0] == ("INSERT", 0)
+
+    tg_user.first_name = "Новое имя"
+    user = await db.upsert_user(tg_user)
+    assert user.first_name == "Новое имя"
+    assert (await db.get_user_by_id(5)).first_name == "Новое имя"
+
+
+@pytest.mark.asyncio
+async def test_order_status_transitions(db, add_products):
+    products = await add_products(db)
+    await db.add_user(1, "user", "Имя", None)
+    order = await db.add_order(
+        1,
+        [CartItem.from_product(products[0], "small", 1)],
+        "Имя",
+        "291234567",
+        "-",
+        None,
+    )
+
+    assert await db.order_set_done(order.id) is True
+    # повторная доставка successful_payment ничего не меняет
+    assert await db.order_set_done(order.id) is False
+    assert await db.order_set_cancelled(order.id) is False
+    assert (await db.get_order_by_id(order.id)).status == "done"
+    assert await db.order_set_done(999) is False
+
+
+@pytest.mark.asyncio
+async def test_telegram_ids_and_string_prices(db):
+    # id пользователей Telegram больше 2**31
+    user_id = 7_123_456_789
+    await db.add_user(user_id, "user", "Имя", None)
+    # из админки цены приходят строками
+    product = await db.add_product(
+        name="Пепперони",
+        price_small="20.5",
+        price_large="",
+        category="pizza",
+        category_rus="пицца",
+        description=None,
+        ingredients=None,
+        nutrition=None,
+        emoji="🍕",
+    )
+    assert (product.price_small, product.price_large) == (20.5, None)
+    await db.edit_product(product.id, "price_small", "21")
+    product = await db.get_product_by_id(product.id)
+    assert product.price_small == 21.0
+
+    order = await db.add_order(
+        user_id,
+        [CartItem.from_product(product, "small", 1)],
+        "Имя",
+        "291234567",
+        "-",
+        None,
+    )
+    assert [o.id for o in await db.get_orders_by_user(user_id)] == [order.id]
+
+
+@pytest.mark.asyncio
+async def test_sales_aggregates(db, add_products):
+    products = await add_products(db)
+    await db.add_user(1, "user", "Имя", None)
+    first = await db.add_order(
+        1,
+        [
+            CartItem.from_product(products[0], "large", 2),
+            CartItem.from_product(products[4], "small", 1),
+        ],
+        "Имя",
+        "291234567",
+        "-",
+        None,
+    )
+    second = await db.add_order(
+        1,
+        [CartItem.from_product(products[0], "small", 1)],
+        "Имя",
+        "291234567",
+        "-",
+        None,
+    )
+    third = await db.add_order(
+        1,
+        [CartItem.from_product(products[4], "small", 3)],
+        "Имя",
+        "291234567",
+        "-",
+        None,
+    )
+
+    assert await db.order_set_done(first.id)
+    assert await db.order_set_done(second.id)
+    # повторная отметка не должна удваивать выручку
+    assert not await db.order_set_done(second.id)
+    assert await db.order_set_cancelled(third.id)
+
+    [day] = await db.get_daily_sales()
+    assert (day.orders_count, day.cancelled_count) == (2, 1)
+    # тот же местный день, что видит пользователь в истории заказов
+    order = await db.get_order_full(first.id)
+    assert day.day == order.created_at_local.date()
+    assert day.revenue == 28.0 * 2 + 3.0 + 20.0
+
+    top = await db.get_top_products()
+    assert [(p.product.name, p.quantity, p.revenue) for p in top] == [
+        ("Пепперони", 3, 76.0),
+        ("Coca-Cola", 1, 3.0),
+    ]
+
+    assert await db.order_set_pending(third.id)
+    [day] = await db.get_daily_sales()
+    assert day.cancelled_count == 0
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.app.bot.services.user_service import profile_fingerprint, register_user
+
+
+def make_redis(cached: dict):
+    mock_redis = AsyncMock()
+    mock_redis.hgetall.return_value = cached
+    mock_redis.pipeline = MagicMock()
+    mock_pipe = mock_redis.pipeline.return_value.__aenter__.return_value
+    mock_pipe.hset = MagicMock()
+    mock_pipe.expire = MagicMock()
+    return mock_redis, mock_pipe
+
+
+@pytest.mark.asyncio
+async def test_register_user_skips_db_for_unchanged_profile():
+    tg_user = SimpleNamespace(id=5, username="user", first_name="Имя", last_name=None)
+    mock_redis, _ = make_redis(
+        {"fingerprint": profile_fingerprint(tg_user), "is_admin": "1"}
+    )
+    mock_db = AsyncMock()
+
+    user = await register_user(tg_user, mock_redis, mock_db)
+
+    mock_db.upsert_user.assert_not_awaited()
+    assert (user.id, user.first_name, user.is_admin) == (5, "Имя", True)
+
+
+@pytest.mark.asyncio
+async def test_register_user_upserts_changed_profile():
+    tg_user = SimpleNamespace(id=5, username="user", first_name="Имя", last_name=None)
+    mock_redis, mock_pipe = make_redis({"fingerprint": "old", "is_admin": "0"})
+    mock_db = AsyncMock()
+    mock_db.upsert_user.return_value = SimpleNamespace(id=5, is_admin=False)
+
+    await register_user(tg_user, mock_redis, mock_db)
+
+    mock_db.upsert_user.assert_awaited_once_with(tg_user)
+    mock_pipe.hset.assert_called_once_with(
+        "user_profile:5",
+        mapping={"fingerprint": profile_fingerprint(tg_user), "is_admin": 0},
+    )
@@ -0,0 +1,68 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Message
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.app.bot.webhook import build_webhook_app, set_webhook
+from src.app.config.settings import settings
+
+UPDATE = {
+    "update_id": 1,
+    "message": {
+        "message_id": 1,
+        "date": 0,
+        "chat": {"id": 5, "type": "private"},
+        "from": {"id": 5, "is_bot": False, "first_name": "Имя"},
+        "text": "привет",
+    },
+}
+
+
+def make_dispatcher(received: asyncio.Queue) -> Dispatcher:
+    router = Router()
+
+    @router.message()
+    async def echo(message: Message):
+        await received.put(message.text)
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp
+
+
+@pytest.mark.asyncio
+async def test_webhook_checks_secret(monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_SECRET", "secret")
+    received = asyncio.Queue()
+    app = build_webhook_app(make_dispatcher(received), Bot("123:abc"))
+
+    async with TestClient(TestServer(app)) as client:
+        response = await client.post(settings.WEBHOOK_PATH, json=UPDATE)
+        assert response.status == 401
+
+        response = await client.post(
+            settings.WEBHOOK_PATH,
+            json=UPDATE,
+            headers={"X-Telegram-Bot-Api-Secret-Token": "secret"},
+        )
+        assert response.status == 200
+        assert await asyncio.wait_for(received.get(), 1) == "привет"
+
+
+@pytest.mark.asyncio
+async def test_set_webhook_limits_allowed_updates(monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_URL", "https://bot.example.com/")
+    monkeypatch.setattr(settings, "WEBHOOK_SECRET", "secret")
+    bot = AsyncMock()
+
+    await set_webhook(bot, make_dispatcher(asyncio.Queue()))
+
+    bot.set_webhook.assert_awaited_once_with(
+        f"https://bot.example.com{settings.WEBHOOK_PATH}",
+        secret_token="secret",
+        allowed_updates=["message"],
+        max_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+    )